@@ -1,43 +1,11 @@
-import os, pandas as pd, streamlit as st
+import os, sys, re, time
+import streamlit as st
 from pathlib import Path
-import datetime as dt
-
-# ==== AI OPERATOR STATUS BADGE ====
-status_file = Path("data/reports")  # folder where AI statuses live
-latest_status = None
-latest_day = None
-
-if status_file.exists():
-    files = sorted(status_file.glob("ai_status_*.txt"))
-    if files:
-        latest_file = files[-1]
-        latest_day = latest_file.stem.replace("ai_status_", "")
-        latest_status = latest_file.read_text(encoding="utf-8")
-
-if latest_status:
-    # Alert if "⚠" found or "anomal" text
-    if ("⚠" in latest_status) or ("anomal" in latest_status.lower()):
-        st.error(f"🔥 AI Operator Alert ({latest_day})\n\n{latest_status}")
-    else:
-        st.success(f"✅ All Systems Nominal ({latest_day})\n\n{latest_status}")
-else:
-    st.info("⏳ Awaiting today's AI Operator status…")
-
-# ---- AI Summary panel (reads newest Markdown if present) ----
-rep_dir = Path("data/reports")
-latest_rep = None
-if rep_dir.exists():
-    reports = sorted(rep_dir.glob("report_*.md"))
-    if reports:
-        latest_rep = reports[-1]
-
-with st.expander("📄 AI Daily Summary (latest)", expanded=True):
-    if latest_rep and latest_rep.exists():
-        st.markdown(latest_rep.read_text(encoding="utf-8"))
-        st.caption(f"Source: {latest_rep.name}")
-    else:
-        st.info("No summary report yet. It will appear after the next workflow run.")
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.data_store import latest_file as latest
 
+_t0 = time.perf_counter()
+_timings: dict[str, float] = {}
 
 st.set_page_config(page_title="AEMO 5-min SCADA MW", layout="wide")
 
@@ -46,32 +14,106 @@ if hasattr(st, "autorefresh"):
     st.autorefresh(interval=300_000, key="auto_refresh_5min")  # 5 minutes
 
 DATA_DIR = os.getenv("AEMO_DATA_DIR", "data/aemo")
-st.title("AEMO 5-min MW Performance — Per-DUID view")
+REP_DIR = Path("data/reports")
+FORE_DIR = Path("data/forecast")
+_DAY_RE = re.compile(r"aemo_(\d{4}-\d{2}-\d{2})_")
+# panels are only rendered (and their data only read) when switched on
+_toggle = getattr(st, "toggle", st.checkbox)
+
+# ==== cached loaders, keyed by file identity (path, mtime, size) ====
+# bounded: a rewritten file gets a new key, so stale entries are evicted instead of piling up
+CACHE_ENTRIES = 64
+def _fid(p: Path) -> tuple[str, int, int]:
+    s = p.stat()
+    return str(p), s.st_mtime_ns, s.st_size
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_ENTRIES)
+def _read_text(path: str, mtime_ns: int, size: int) -> str:
+    return Path(path).read_text(encoding="utf-8")
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_ENTRIES)
+def _read_csv(path: str, mtime_ns: int, size: int):
+    import pandas as pd
+    df = pd.read_csv(path, parse_dates=["timestamp"])
+    if "power_MW" in df:
+        df["day"] = df["timestamp"].dt.strftime("%Y-%m-%d")
+    return df
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _cached_coramp(path: str, mtime_ns: int, size: int):
+    from src.coramp import load_matrix
+    return load_matrix(path)
+
+def read_text(p: Path) -> str:
+    return _read_text(*_fid(p))
 
+def read_csv(p: Path):
+    return _read_csv(*_fid(p))
 
-def load_all():
-    files = sorted(Path(DATA_DIR).glob("aemo_*_*_5min.csv"))
+def aemo_files_by_day() -> dict[str, list[Path]]:
+    out: dict[str, list[Path]] = {}
+    for f in sorted(Path(DATA_DIR).glob("aemo_*_*_5min.csv")):
+        m = _DAY_RE.search(f.name)
+        if m:
+            out.setdefault(m.group(1), []).append(f)
+    return out
+
+def load_days(files: list[Path]):
+    """Concatenate cached per-file frames; later files win on duplicate (duid, timestamp)."""
+    import pandas as pd
     if not files:
         return pd.DataFrame(columns=["timestamp","duid","power_MW","day"])
-    dfs = []
-    for f in files:
-        df = pd.read_csv(f, parse_dates=["timestamp"])
-        df["day"] = df["timestamp"].dt.strftime("%Y-%m-%d")
-        dfs.append(df)
-    return pd.concat(dfs, ignore_index=True)
+    df = pd.concat([read_csv(f) for f in files], ignore_index=True)
+    return df.drop_duplicates(["duid","timestamp"], keep="last")
+
+class _timed:
+    def __init__(self, name): self.name = name
+    def __enter__(self): self.t = time.perf_counter()
+    def __exit__(self, *exc): _timings[self.name] = time.perf_counter() - self.t
+
+# ==== AI OPERATOR STATUS BADGE ====
+with _timed("status"):
+    latest_file = latest(REP_DIR, "ai_status_*.txt")  # folder where AI statuses live
+    latest_status = read_text(latest_file) if latest_file else None
+    latest_day = latest_file.stem.replace("ai_status_", "") if latest_file else None
+
+    if latest_status:
+        # Alert if "⚠" found or "anomal" text
+        if ("⚠" in latest_status) or ("anomal" in latest_status.lower()):
+            st.error(f"🔥 AI Operator Alert ({latest_day})\n\n{latest_status}")
+        else:
+            st.success(f"✅ All Systems Nominal ({latest_day})\n\n{latest_status}")
+    else:
+        st.info("⏳ Awaiting today's AI Operator status…")
+
+# ---- AI Summary panel (reads newest Markdown if present) ----
+if _toggle("📄 AI Daily Summary (latest)", value=True, key="show_summary"):
+    with _timed("summary"), st.container():
+        latest_rep = latest(REP_DIR, "report_*.md")
+        if latest_rep:
+            st.markdown(read_text(latest_rep))
+            st.caption(f"Source: {latest_rep.name}")
+        else:
+            st.info("No summary report yet. It will appear after the next workflow run.")
+
+st.title("AEMO 5-min MW Performance — Per-DUID view")
 
-df = load_all()
-if df.empty:
+# Days come from file names; only the selected day's CSVs are read
+by_day = aemo_files_by_day()
+if not by_day:
     st.warning("No data yet. Fetch once locally or wait for the daily job.")
     st.stop()
 
 # Always default to the latest day present in files
-days = sorted(df["day"].unique())
+days = sorted(by_day)
 latest_idx = len(days) - 1
 colA, colB = st.columns(2)
 day = colA.selectbox("Day", days, index=latest_idx)
+with _timed("day data"):
+    df = load_days(by_day[day])
 duids = sorted(df["duid"].unique())
-preferred = ["CLUNY","BUTLERSG","CRURWF1","DUNDWF3","JBUTTERS","LOYYB2"]
+from src.duid_registry import registry_duids
+preferred = registry_duids()
 defaults = [d for d in preferred if d in duids] or [duids[0]]
 picked = colB.multiselect("DUID(s)", duids, default=defaults)
 
@@ -93,54 +135,123 @@ for d in picked:
         st.dataframe(kpi, use_container_width=True, height=90)
         st.line_chart(sub.set_index("timestamp")["power_MW"])
 
+# ---- BESS cycles & state of charge ----
+if _toggle("🔋 BESS cycles & state of charge", value=False, key="show_bess"):
+    with _timed("bess"), st.container():
+        from src.bess_analytics import BessConfig, bess_daily_stats, implied_soc
+        bess_cfg = BessConfig()
+        bess_picked = [d for d in picked if d in bess_cfg.duids]
+        if not bess_picked:
+            st.info(f"No BESS DUIDs selected (configured: {', '.join(bess_cfg.duids)}).")
+        else:
+            # SoC is anchored per (duid, day), so the selected day's rows are enough
+            day_df = df[df["duid"].isin(bess_picked)]
+            stats = bess_daily_stats(day_df, bess_cfg)
+            st.dataframe(stats.drop(columns=["cycle_depth_hist"]), use_container_width=True)
+            soc = implied_soc(day_df, bess_cfg)
+            if soc["soc_frac"].notna().any():
+                st.write("Implied SoC above the day's low (fraction of capacity)")
+                st.line_chart(soc.pivot(index="timestamp", columns="duid", values="soc_frac"))
+                if soc["saturated"].any():
+                    st.warning("Implied SoC exceeds 1 for " + ", ".join(sorted(soc.loc[soc["saturated"], "duid"].unique()))
+                               + " — the trace does not fit the configured capacity / efficiency.")
+            else:
+                st.write("Implied stored energy (MWh above the day's low)")
+                st.line_chart(soc.pivot(index="timestamp", columns="duid", values="energy_mwh"))
+            st.caption("Capacity from storage_mwh in data/registry/duids.csv or BESS_CAPACITY_MWH "
+                       "(e.g. CLUNY=100,BUTLERSG=50); without one, EFC, SoC and depth histogram are blank. "
+                       "Gaps are interpolated on the 5-min grid before integrating.")
+
+# ---- Fleet view (materialized at ingest in data/fleet) ----
+if _toggle("🌏 Fleet view (region / technology / BESS)", value=False, key="show_fleet"):
+    with _timed("fleet"), st.container():
+        from src.duid_registry import fleet_path
+        _fleet = fleet_path(day)
+        if _fleet.exists():
+            fl = read_csv(_fleet)
+            for dim, title in (("region", "Regional totals (MW)"), ("technology", "By technology (MW)"),
+                               ("bess", "BESS net charge (MW, >0 = charging)")):
+                sub = fl[fl["dimension"] == dim]
+                if sub.empty:
+                    continue
+                st.write(f"**{title}**")
+                st.line_chart(sub.pivot(index="timestamp", columns="key", values="power_MW"))
+            cf = fl[fl["capacity_factor"].notna()].groupby(["dimension","key"])["capacity_factor"].mean()
+            if not cf.empty:
+                st.write("**Mean capacity factor (units with registered capacity)**")
+                st.dataframe(cf.rename("capacity_factor").reset_index(), use_container_width=True)
+            st.caption(f"Source: {_fleet.name}")
+        else:
+            st.info("No fleet aggregates for this day. Run `python -m src.duid_registry` to build them.")
+
+# ---- Co-ramp heatmap (running over all ingested days, data/coramp) ----
+if _toggle("🔗 Co-ramp correlation (5-min deltas)", value=False, key="show_coramp"):
+    with _timed("co-ramp"), st.container():
+        from src.coramp import CORAMP_DIR, STATE_NAME, state_days
+        _state = CORAMP_DIR / STATE_NAME
+        if _state.exists():
+            import altair as alt
+            mat = _cached_coramp(*_fid(_state))
+            shown = [d for d in picked if d in set(mat["duid_a"])] if len(picked) > 1 else sorted(set(mat["duid_a"]))
+            mat = mat[mat["duid_a"].isin(shown) & mat["duid_b"].isin(shown)]
+            metric = st.radio("Cell value", ["corr", "co_same", "co_opp"], horizontal=True, key="coramp_metric",
+                              format_func={"corr": "correlation", "co_same": "co-ramps (same direction)",
+                                           "co_opp": "co-ramps (opposite direction)"}.get)
+            scale = (alt.Scale(scheme="redblue", domain=[-1, 1], reverse=True) if metric == "corr"
+                     else alt.Scale(scheme="oranges"))
+            st.altair_chart(alt.Chart(mat).mark_rect().encode(
+                x=alt.X("duid_b:N", title=None), y=alt.Y("duid_a:N", title=None),
+                color=alt.Color(f"{metric}:Q", scale=scale),
+                tooltip=["duid_a", "duid_b", "n", alt.Tooltip("corr:Q", format="+.2f"), "co_same", "co_opp"],
+            ), use_container_width=True)
+            st.caption(f"{len(state_days(_state))} day(s) · pick 2+ DUIDs above to narrow the matrix · "
+                       f"Source: {_state.name}")
+        else:
+            st.info("No co-ramp state yet. Run `python -m src.coramp` to build it.")
+
 # ---- Forecast panel (next-day) ----
-from pathlib import Path as _Path
-import pandas as _pd
-
-_fdir = _Path("data/forecast")
-_latest_fore = None
-if _fdir.exists():
-    _cand = sorted(_fdir.glob("forecast_*_nextday.csv"))
-    if _cand:
-        _latest_fore = _cand[-1]
-
-with st.expander("🔮 Next-day Forecast (per DUID)", expanded=False):
-    if _latest_fore:
-        fdf = _pd.read_csv(_latest_fore, parse_dates=["timestamp"])
-        day_next = fdf["timestamp"].dt.strftime("%Y-%m-%d").min()
-        st.caption(f"Forecast day: {day_next}  ·  Source: {_latest_fore.name}")
-        for d in picked:
-            subf = fdf[fdf["duid"] == d]
-            if subf.empty:
-                st.info(f"No forecast for {d}.")
-                continue
-            st.write(f"**{d}** forecast (MW)")
-            st.line_chart(subf.set_index("timestamp")["power_hat_MW"])
-    else:
-        st.info("No forecast file yet. It appears after the daily workflow runs.")
+if _toggle("🔮 Next-day Forecast (per DUID)", value=False, key="show_forecast"):
+    with _timed("forecast"), st.container():
+        _latest_fore = latest(FORE_DIR, "forecast_*_nextday.csv")
+        if _latest_fore:
+            fdf = read_csv(_latest_fore)
+            day_next = fdf["timestamp"].dt.strftime("%Y-%m-%d").min()
+            st.caption(f"Forecast day: {day_next}  ·  Source: {_latest_fore.name}")
+            for d in picked:
+                subf = fdf[fdf["duid"] == d]
+                if subf.empty:
+                    st.info(f"No forecast for {d}.")
+                    continue
+                st.write(f"**{d}** forecast (MW)")
+                st.line_chart(subf.set_index("timestamp")["power_hat_MW"])
+        else:
+            st.info("No forecast file yet. It appears after the daily workflow runs.")
 
 # ---- Forecast ramp alerts ----
-_ra = None
-if _fdir.exists():
-    _cand = sorted(_fdir.glob("ramp_alerts_*_nextday.csv"))
-    if _cand:
-        _ra = _cand[-1]
-
-with st.expander("⚠️ Predicted Ramp Alerts (next day)", expanded=False):
-    if _ra:
-        try:
-            radf = _pd.read_csv(_ra, parse_dates=["timestamp"])
-        except Exception as e:
-            st.warning(f"Could not read {_ra.name}: {e}")
-            radf = _pd.DataFrame(columns=["timestamp","duid","predicted_ramp_MW"])
-
-        if radf.empty or {"timestamp","duid","predicted_ramp_MW"}.difference(radf.columns):
-            st.info("No predicted ramp alerts.")
-        else:
-            show = radf[radf["duid"].isin(picked)].copy()
-            if show.empty:
-                st.info("No predicted ramps for selected DUIDs.")
+if _toggle("⚠️ Predicted Ramp Alerts (next day)", value=False, key="show_ramps"):
+    with _timed("ramp alerts"), st.container():
+        import pandas as pd
+        _ra = latest(FORE_DIR, "ramp_alerts_*_nextday.csv")
+        if _ra:
+            try:
+                radf = read_csv(_ra)
+            except Exception as e:
+                st.warning(f"Could not read {_ra.name}: {e}")
+                radf = pd.DataFrame(columns=["timestamp","duid","predicted_ramp_MW"])
+
+            if radf.empty or {"timestamp","duid","predicted_ramp_MW"}.difference(radf.columns):
+                st.info("No predicted ramp alerts.")
             else:
-                st.dataframe(show.sort_values(["duid","timestamp"]), use_container_width=True)
-    else:
-        st.info("No ramp-alert file yet.")
+                show = radf[radf["duid"].isin(picked)].copy()
+                if show.empty:
+                    st.info("No predicted ramps for selected DUIDs.")
+                else:
+                    st.dataframe(show.sort_values(["duid","timestamp"]), use_container_width=True)
+        else:
+            st.info("No ramp-alert file yet.")
+
+# ---- footer: render timings ----
+_total = time.perf_counter() - _t0
+st.divider()
+st.caption(f"Rendered in {_total*1000:.0f} ms · " +
+           " · ".join(f"{k} {v*1000:.0f} ms" for k, v in _timings.items()))
@@ -11,6 +11,9 @@ ARCHIVE_BASE = "https://www.nemweb.com.au/REPORTS/ARCHIVE/Dispatch_SCADA"
 CURRENT_BASE = "https://www.nemweb.com.au/REPORTS/CURRENT/Dispatch_SCADA"
 UA = {"User-Agent": "aemo-fetcher/1.2 (python-requests)"}
 
+class RangeNotSupported(OSError):
+    """The server answered a Range request with the whole body (no 206)."""
+
 # ---------- HTTP utils ----------
 def make_session(retries: int = 5, backoff: float = 0.5) -> requests.Session:
     s = requests.Session()
@@ -32,6 +35,51 @@ def get_bytes(url: str, sess: requests.Session, timeout=(8, 30)) -> bytes:
     resp.raise_for_status()
     return resp.content
 
+class HttpRangeFile(io.RawIOBase):
+    """Seekable read-only view of a remote file via HTTP Range requests, so zipfile can read a
+    large archive's central directory and single members without downloading the whole file."""
+    def __init__(self, url: str, sess: requests.Session, block: int = 64 * 1024, timeout=(8, 30)):
+        super().__init__()
+        self.url, self.sess, self.block, self.timeout = url, sess, block, timeout
+        # probe with a 1-byte ranged GET: many servers honour ranges without advertising
+        # Accept-Ranges on HEAD, and the 206's Content-Range carries the total size
+        with sess.get(url, headers={**UA, "Range": "bytes=0-0"}, timeout=timeout, stream=True) as r:
+            if r.status_code == 404:
+                raise FileNotFoundError(url)
+            r.raise_for_status()
+            total = r.headers.get("Content-Range", "").rpartition("/")[2]
+            if r.status_code != 206 or not total.isdigit():
+                raise RangeNotSupported(f"Range request not honoured ({r.status_code}): {url}")
+        self.size = int(total)
+        self.pos = 0
+        self._buf_start, self._buf = 0, b""
+
+    def readable(self): return True
+    def seekable(self): return True
+    def tell(self): return self.pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self.pos, io.SEEK_END: self.size}[whence]
+        self.pos = max(0, base + offset)
+        return self.pos
+
+    def read(self, n=-1):
+        if n is None or n < 0:
+            n = self.size - self.pos
+        n = min(n, self.size - self.pos)
+        if n <= 0:
+            return b""
+        lo = self.pos - self._buf_start
+        if not (0 <= lo and lo + n <= len(self._buf)):
+            end = min(self.size, self.pos + max(n, self.block)) - 1
+            r = self.sess.get(self.url, headers={**UA, "Range": f"bytes={self.pos}-{end}"}, timeout=self.timeout)
+            if r.status_code != 206:
+                raise RangeNotSupported(f"Range request not honoured ({r.status_code}): {self.url}")
+            self._buf_start, self._buf, lo = self.pos, r.content, 0
+        data = self._buf[lo:lo + n]
+        self.pos += len(data)
+        return data
+
 # ---------- Banner CSV parser ----------
 def parse_banner_zip_bytes(raw_zip: bytes) -> pd.DataFrame:
     """Return dataframe with columns: timestamp, duid, power_MW (parsed from 'banner' CSV)."""
@@ -84,6 +132,57 @@ def fetch_current_day_df(yyyymmdd: str, sess: requests.Session) -> pd.DataFrame:
             continue
     return pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
 
+_INTERVAL_RE = re.compile(r"PUBLIC_DISPATCHSCADA_(\d{12})_\d+\.zip", re.I)
+
+def fetch_current_intervals_df(stamps: Iterable[str], sess: requests.Session) -> pd.DataFrame:
+    """Fetch only the CURRENT interval zips whose YYYYMMDDHHMM is in stamps."""
+    want = set(stamps)
+    parts: List[pd.DataFrame] = []
+    for day in sorted({s[:8] for s in want}):
+        for u in list_current_day_urls(day, sess):
+            m = _INTERVAL_RE.search(u)
+            if not m or m.group(1) not in want:
+                continue
+            try:
+                df = parse_banner_zip_bytes(get_bytes(u, sess))
+                if not df.empty: parts.append(df)
+            except Exception:
+                continue
+    return pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
+
+def _archive_members_df(z: zipfile.ZipFile, want: set) -> pd.DataFrame:
+    parts: List[pd.DataFrame] = []
+    for n in z.namelist():
+        m = _INTERVAL_RE.search(n)
+        if m and m.group(1) in want:
+            df = parse_banner_zip_bytes(z.read(n))
+            if not df.empty: parts.append(df)
+    return pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
+
+def fetch_archive_intervals_df(yyyymmdd: str, stamps: Iterable[str], sess: requests.Session) -> pd.DataFrame:
+    """Read single interval zips out of the ARCHIVE daily zip using HTTP range requests,
+    downloading the whole day zip when the server does not honour ranges."""
+    want = set(stamps)
+    url = f"{ARCHIVE_BASE}/PUBLIC_DISPATCHSCADA_{yyyymmdd}.zip"
+    print(f"→ range-reading {url}")
+    try:
+        with zipfile.ZipFile(HttpRangeFile(url, sess)) as z:
+            return _archive_members_df(z, want)
+    except FileNotFoundError:
+        print(f"⚠️ archive repair skipped for {yyyymmdd}: {url} not found")
+        return pd.DataFrame()
+    except RangeNotSupported as e:
+        print(f"⚠️ {e}; downloading the whole archive day instead")
+    except (OSError, zipfile.BadZipFile, requests.RequestException) as e:
+        print(f"⚠️ archive repair skipped for {yyyymmdd}: range read failed ({e})")
+        return pd.DataFrame()
+    try:
+        with zipfile.ZipFile(io.BytesIO(get_bytes(url, sess))) as z:
+            return _archive_members_df(z, want)
+    except (FileNotFoundError, zipfile.BadZipFile, requests.RequestException) as e:
+        print(f"⚠️ archive repair skipped for {yyyymmdd}: download failed ({e})")
+        return pd.DataFrame()
+
 def filter_duids(df: pd.DataFrame, duids: Iterable[str]) -> pd.DataFrame:
     want = {d.strip().upper() for d in duids if d.strip()}
     if not want or "*" in want: return df
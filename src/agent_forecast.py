@@ -5,6 +5,8 @@ from dataclasses import dataclass
 from pathlib import Path
 import numpy as np
 import pandas as pd
+from src.data_store import latest_file
+from src.completeness import nem_grid
 
 @dataclass
 class ForecastConfig:
@@ -12,11 +14,27 @@ class ForecastConfig:
     ramp_alert_sigma: float = 2.0
 
 def forecast_series(y: pd.Series, alpha: float) -> pd.Series:
-    y = pd.to_numeric(y, errors="coerce").fillna(method="ffill").fillna(0.0)
-    yhat = [y.iloc[0]]
-    for i in range(1, len(y)):
-        yhat.append(alpha * y.iloc[i-1] + (1-alpha) * yhat[-1])
-    return pd.Series(yhat, index=y.index)
+    """One-step EWMA. Missing values are gaps, not observations: the state is held across them
+    (NaN before the first reading), so a gap neither invents readings nor decays the level."""
+    idx = y.index
+    y = pd.to_numeric(y, errors="coerce").to_numpy(dtype=float)
+    yhat = np.full(len(y), np.nan)
+    ok = np.flatnonzero(~np.isnan(y))
+    if ok.size:
+        ht = y[ok[0]]
+        yhat[ok[0]] = ht
+        for i in range(ok[0] + 1, len(y)):
+            if not np.isnan(y[i-1]):
+                ht = alpha * y[i-1] + (1-alpha) * ht
+            yhat[i] = ht
+    return pd.Series(yhat, index=idx)
+
+def on_grid(sub: pd.DataFrame) -> pd.Series:
+    """One DUID's power on the 5-min NEM grid of every day it covers; missing intervals are NaN."""
+    days = sub["timestamp"].dt.floor("D").unique()
+    grid = nem_grid(days[0]).append([nem_grid(d) for d in days[1:]]) if len(days) else pd.DatetimeIndex([])
+    p = pd.to_numeric(sub["power_MW"], errors="coerce")
+    return pd.Series(p.to_numpy(), index=sub["timestamp"]).groupby(level=0).last().reindex(grid)
 
 def forecast_next_day(df: pd.DataFrame, cfg: ForecastConfig) -> tuple[pd.DataFrame, pd.DataFrame]:
     out_rows, alert_rows = [], []
@@ -34,12 +52,13 @@ def forecast_next_day(df: pd.DataFrame, cfg: ForecastConfig) -> tuple[pd.DataFra
                              freq="5min")
 
     for duid, sub in df.groupby("duid", as_index=False):
-        p = pd.to_numeric(sub["power_MW"], errors="coerce").fillna(method="ffill").fillna(0.0).reset_index(drop=True)
-        if len(p) == 0:
+        p = on_grid(sub)
+        valid = np.flatnonzero(p.notna().to_numpy())
+        if valid.size == 0:
             continue
 
-        yhat_in = forecast_series(p, cfg.alpha)
-        last_hat = yhat_in.iloc[-1]
+        # EWMA state at the last reading; gaps stay gaps (no forward fill)
+        last_hat = forecast_series(p, cfg.alpha).iloc[valid[-1]]
         mean_level = float(p.mean())
 
         ph, ht = [], float(last_hat)
@@ -50,7 +69,7 @@ def forecast_next_day(df: pd.DataFrame, cfg: ForecastConfig) -> tuple[pd.DataFra
         fduid = pd.DataFrame({"timestamp": idx_next, "duid": duid, "power_hat_MW": ph})
         out_rows.append(fduid)
 
-        # ramp alert threshold from historical deltas (guard zeros/NaNs)
+        # ramp alert threshold from deltas between adjacent valid intervals only
         deltas = p.diff()
         ramp_sd = float(deltas.std(ddof=0)) if deltas.notna().any() else 0.0
         ramp_thr = cfg.ramp_alert_sigma * ramp_sd
@@ -81,10 +100,9 @@ def main():
     if args.file:
         f = Path(args.file)
     else:
-        cand = sorted(Path("data/aemo").glob("aemo_*_*_5min.csv"))
-        if not cand:
+        f = latest_file("data/aemo", "aemo_*_*_5min.csv")
+        if f is None:
             raise SystemExit("No daily CSVs in data/aemo.")
-        f = cand[-1]
 
     df = pd.read_csv(f, parse_dates=["timestamp"])
     cfg = ForecastConfig(alpha=args.alpha, ramp_alert_sigma=args.ramp_sigma)
@@ -5,6 +5,7 @@ from pathlib import Path
 from typing import Dict, Any
 import pandas as pd
 import numpy as np
+from src.data_store import latest_file
 
 # ---------- Config ----------
 MAX_TOKENS_PER_DAY = 5000
@@ -22,21 +23,19 @@ def _exists(p: Path) -> bool:
         return False
 
 def load_latest_analysis() -> Dict[str, Any]:
-    reports = sorted(Path("data/reports").glob("report_*.json"))
-    if not reports:
+    f = latest_file("data/reports", "report_*.json")
+    if f is None:
         log.warning("No analysis JSON found in data/reports.")
         return {}
-    f = reports[-1]
     log.info(f"Using analysis JSON: {f.name}")
     with open(f, "r", encoding="utf-8") as fp:
         return json.load(fp)
 
 def load_latest_forecast() -> pd.DataFrame:
-    cand = sorted(Path("data/forecast").glob("forecast_*_nextday.csv"))
-    if not cand:
+    f = latest_file("data/forecast", "forecast_*_nextday.csv")
+    if f is None:
         log.warning("No forecast CSV found in data/forecast.")
         return pd.DataFrame(columns=["timestamp","duid","power_hat_MW"])
-    f = cand[-1]
     log.info(f"Using forecast CSV: {f.name}")
     return pd.read_csv(f, parse_dates=["timestamp"])
 
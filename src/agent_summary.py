@@ -1,9 +1,11 @@
 # src/agent_summary.py
 from __future__ import annotations
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, List, Tuple
 import numpy as np
 import pandas as pd
+from src.bess_analytics import BessConfig, bess_daily_stats
+from src.completeness import nem_grid, nem_now
 
 @dataclass
 class DuidSummary:
@@ -26,9 +28,25 @@ class DuidSummary:
     intraday_down_bursts: int      # # of contiguous segments with strong -slope
     diurnal_profile: List[Tuple[int,float]]  # [(hour, mean_MW)]
     notes: List[str]
+    # ===== completeness (vs the 288-interval NEM grid) =====
+    n_missing: int = 0
+    coverage: float = 1.0
+    # ===== BESS (filled for configured battery DUIDs only) =====
+    charge_mwh: float = 0.0
+    discharge_mwh: float = 0.0
+    capacity_mwh: float | None = None   # configured usable energy; None = EFC / SoC / depths unknown
+    equiv_full_cycles: float | None = None
+    rainflow_cycles: float = 0.0
+    cycle_depth_hist: List[float] = field(default_factory=list)  # counts per 10% depth-of-discharge bin
+    soc_swing_frac: float | None = None   # implied SoC max - min over the day (fraction of capacity)
+    soc_saturated: bool = False           # swing > 1: the trace does not fit the configured capacity
+    imputed_intervals: int = 0            # grid gaps filled before integrating
+    # ===== co-ramp vs other DUIDs (running over all ingested days, src/coramp.py) =====
+    co_ramp: List[dict] = field(default_factory=list)   # top partners: {duid, corr, n, co_same, co_opp}
 
 def _find_zero_runs(s: pd.Series, min_points: int = 3) -> List[Tuple[int,int]]:
-    z = (s.fillna(0) == 0).astype(int)
+    # NaN (missing interval) is not zero output and breaks a run
+    z = (s == 0).astype(int)
     edges = z.diff().fillna(z.iloc[0]).ne(0)
     idx = np.flatnonzero(edges.values)
     idx = np.r_[idx, len(z)]
@@ -80,11 +98,17 @@ def summarize_duid(df: pd.DataFrame, duid: str) -> DuidSummary:
     ramp_max = float(np.nanmax(ramp))
     ramp_95p = float(np.nanpercentile(ramp.dropna(), 95)) if ramp.notna().any() else 0.0
 
-    runs = _find_zero_runs(p, min_points=3)
+    # outages are searched on the full 5-min grid so gaps in the data cannot bridge zero runs
+    grid = nem_grid(day)
+    expected = grid[grid <= nem_now()]
+    pg = (sub.drop_duplicates("timestamp", keep="last").set_index("timestamp")["power_MW"]
+             .astype(float).reindex(grid.union(sub["timestamp"])))
+    runs = _find_zero_runs(pg, min_points=3)
     outages = []
     for a, b in runs:
-        t0 = sub["timestamp"].iloc[a]; t1 = sub["timestamp"].iloc[b]
+        t0 = pg.index[a]; t1 = pg.index[b]
         outages.append((t0.isoformat(), t1.isoformat(), (b-a+1)))
+    n_missing = int(len(expected.difference(sub["timestamp"])))
 
     anom_mask = _zscore_anomalies(p, win=12, z_thr=3.0)
     anomalies = int(anom_mask.fillna(False).sum())
@@ -104,6 +128,7 @@ def summarize_duid(df: pd.DataFrame, duid: str) -> DuidSummary:
     if ramp_max > max(20.0, 0.2*(np.nanmax(p)-np.nanmin(p))):
         notes.append(f"Large ramp detected: {ramp_max:.1f} MW/5min.")
     if outages: notes.append(f"{len(outages)} outage-like zero segments (≥15 min).")
+    if n_missing: notes.append(f"{n_missing} missing 5-min intervals.")
     if anomalies > 0: notes.append(f"{anomalies} spike/step anomalies flagged.")
     if abs(slope_mw_per_hr) > 5.0:
         notes.append(f"Monotonic trend: slope {slope_mw_per_hr:+.1f} MW/h.")
@@ -114,11 +139,26 @@ def summarize_duid(df: pd.DataFrame, duid: str) -> DuidSummary:
         energy_mwh=energy_mwh, zero_frac=float((p==0).mean()), neg_frac=float((p<0).mean()),
         ramp_max=ramp_max, ramp_95p=ramp_95p, outages=outages, anomalies=anomalies,
         slope_mw_per_hr=slope_mw_per_hr, intraday_up_bursts=up_bursts, intraday_down_bursts=down_bursts,
-        diurnal_profile=diurnal_profile, notes=notes
+        diurnal_profile=diurnal_profile, notes=notes,
+        n_missing=n_missing, coverage=float(1 - n_missing/max(len(expected), 1)),
     )
 
-def summarize_day(df: pd.DataFrame) -> Dict[str, DuidSummary]:
-    return {d: summarize_duid(df, d) for d in sorted(df["duid"].unique())}
+def summarize_day(df: pd.DataFrame, bess: BessConfig | None = None) -> Dict[str, DuidSummary]:
+    # one pass over groups instead of re-filtering the frame per DUID (O(rows) for "*" days)
+    sums = {d: summarize_duid(sub, d) for d, sub in df.groupby("duid", sort=True, observed=True)}
+    for r in bess_daily_stats(df, bess).itertuples(index=False):
+        s = sums.get(r.duid)
+        if s is None or s.day != r.day:
+            continue
+        s.charge_mwh, s.discharge_mwh = float(r.charge_mwh), float(r.discharge_mwh)
+        s.rainflow_cycles = float(r.n_cycles)
+        s.imputed_intervals = int(r.imputed_intervals)
+        if pd.notna(r.capacity_mwh):
+            s.capacity_mwh = float(r.capacity_mwh)
+            s.equiv_full_cycles = float(r.equiv_full_cycles)
+            s.cycle_depth_hist = list(r.cycle_depth_hist)
+            s.soc_swing_frac, s.soc_saturated = float(r.soc_swing_frac), bool(r.soc_saturated)
+    return sums
 
 def render_markdown(sums: Dict[str, DuidSummary]) -> str:
     lines = ["# AEMO Daily Operational Summary"]
@@ -128,7 +168,7 @@ def render_markdown(sums: Dict[str, DuidSummary]) -> str:
     for d, s in sums.items():
         lines += [
             f"## {d}",
-            f"- Rows: {s.n_rows}",
+            f"- Rows: {s.n_rows} (coverage **{100*s.coverage:.1f}%**, missing intervals **{s.n_missing}**)",
             f"- Power (MW): min **{s.p_min:.2f}**, mean **{s.p_mean:.2f}**, max **{s.p_max:.2f}**",
             f"- Energy: **{s.energy_mwh:.2f} MWh**",
             f"- Zero-output fraction: **{100*s.zero_frac:.1f}%**, Negative fraction: **{100*s.neg_frac:.2f}%**",
@@ -136,6 +176,18 @@ def render_markdown(sums: Dict[str, DuidSummary]) -> str:
             f"- Trend slope: **{s.slope_mw_per_hr:+.2f} MW/h**; Burst up/down: **{s.intraday_up_bursts}/{s.intraday_down_bursts}**",
             "- Diurnal profile (hour → mean MW): " + ", ".join([f"{h:02d}:{v:.1f}" for h,v in s.diurnal_profile]),
         ]
+        if s.capacity_mwh is not None:
+            lines.append(
+                f"- BESS: charge **{s.charge_mwh:.1f} MWh**, discharge **{s.discharge_mwh:.1f} MWh**, "
+                f"EFC **{s.equiv_full_cycles:.2f}**, rainflow cycles **{s.rainflow_cycles:g}**, "
+                f"SoC swing **{100*s.soc_swing_frac:.0f}%** of {s.capacity_mwh:g} MWh"
+                + (" ⚠ exceeds capacity (check storage_mwh / efficiency)" if s.soc_saturated else "")
+                + (f", {s.imputed_intervals} gap interval(s) interpolated" if s.imputed_intervals else ""))
+        elif s.charge_mwh or s.discharge_mwh:
+            lines.append(
+                f"- BESS: charge **{s.charge_mwh:.1f} MWh**, discharge **{s.discharge_mwh:.1f} MWh**, "
+                f"rainflow cycles **{s.rainflow_cycles:g}**; EFC / SoC n/a (no storage_mwh in "
+                f"data/registry/duids.csv or BESS_CAPACITY_MWH)")
         if s.outages:
             total_pts = sum(n for *_ , n in s.outages)
             lines.append(f"- Outage-like zero segments: **{len(s.outages)}** (total points **{total_pts}**)")
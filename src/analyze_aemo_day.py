@@ -2,30 +2,27 @@
 from __future__ import annotations
 import argparse, json
 from pathlib import Path
+from typing import Dict
 import pandas as pd
-from src.agent_summary import summarize_day, render_markdown
+from src.data_store import latest_file
+from src.agent_summary import DuidSummary, summarize_day, render_markdown
+from src.duid_registry import fleet_path, fleet_markdown
+from src.coramp import CORAMP_DIR, STATE_NAME, coramp_markdown, load_matrix, report_rows, state_days, update_state
 
-def main():
-    ap = argparse.ArgumentParser()
-    ap.add_argument("--file", help="Path to aemo_YYYY-MM-DD_*.csv. If omitted, use newest in data/aemo.")
-    ap.add_argument("--outdir", default="data/reports", help="Output dir for report.md and report.json")
-    args = ap.parse_args()
-
-    if args.file:
-        f = Path(args.file)
-    else:
-        cand = sorted(Path("data/aemo").glob("aemo_*_*_5min.csv"))
-        if not cand:
-            raise SystemExit("No daily CSVs in data/aemo.")
-        f = cand[-1]
-
-    df = pd.read_csv(f, parse_dates=["timestamp"])
-    sums = summarize_day(df)
+def write_report(sums: Dict[str, DuidSummary], outdir: Path, day: str) -> tuple[Path, Path]:
     md = render_markdown(sums)
-
-    outdir = Path(args.outdir); outdir.mkdir(parents=True, exist_ok=True)
-    # infer day from file content (safer)
-    day = df["timestamp"].dt.strftime("%Y-%m-%d").iloc[0]
+    fleet_csv = fleet_path(day)
+    if fleet_csv.exists():
+        md += "\n" + fleet_markdown(pd.read_csv(fleet_csv))
+    state = CORAMP_DIR / STATE_NAME
+    if state.exists():
+        mat = load_matrix(state)
+        rows = report_rows(mat, sums)
+        for d, s in sums.items():
+            s.co_ramp = rows.get(d, [])
+        md += "\n" + coramp_markdown(mat[mat["duid_a"].isin(sums) & mat["duid_b"].isin(sums)],
+                                     len(state_days(state)))
+    outdir = Path(outdir); outdir.mkdir(parents=True, exist_ok=True)
     md_path = outdir / f"report_{day}.md"
     json_path = outdir / f"report_{day}.json"
 
@@ -40,6 +37,27 @@ def main():
         # Ensure all numpy types are converted to native Python types
         as_dict_py = json.loads(json.dumps(as_dict, default=lambda x: float(x) if hasattr(x, "item") else x))
         json.dump(as_dict_py, fp, ensure_ascii=False, indent=2)
+    return md_path, json_path
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--file", help="Path to aemo_YYYY-MM-DD_*.csv. If omitted, use newest in data/aemo.")
+    ap.add_argument("--outdir", default="data/reports", help="Output dir for report.md and report.json")
+    args = ap.parse_args()
+
+    if args.file:
+        f = Path(args.file)
+    else:
+        f = latest_file("data/aemo", "aemo_*_*_5min.csv")
+        if f is None:
+            raise SystemExit("No daily CSVs in data/aemo.")
+
+    df = pd.read_csv(f, parse_dates=["timestamp"])
+    sums = summarize_day(df)
+    # infer day from file content (safer)
+    day = df["timestamp"].dt.strftime("%Y-%m-%d").iloc[0]
+    update_state(df, day)
+    md_path, json_path = write_report(sums, Path(args.outdir), day)
 
     print(f"✅ wrote {md_path}")
     print(f"✅ wrote {json_path}")
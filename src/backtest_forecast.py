@@ -0,0 +1,183 @@
+# src/backtest_forecast.py
+from __future__ import annotations
+import argparse, os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List
+import numpy as np
+import pandas as pd
+from src.agent_forecast import ForecastConfig, on_grid
+
+N_NEXT = 288  # 5-min intervals in the forecast day (same horizon as forecast_next_day)
+
+def parse_grid(spec: str) -> np.ndarray:
+    """'0.1,0.3,0.5' or 'start:stop:step' (stop inclusive) -> sorted unique float array."""
+    if ":" in spec:
+        a, b, st = (float(x) for x in spec.split(":"))
+        vals = np.arange(a, b + st/2, st)
+    else:
+        vals = np.array([float(x) for x in spec.split(",") if x.strip()])
+    return np.unique(np.round(vals, 6))
+
+def load_history(pattern: str = "data/aemo/aemo_*_*_5min.csv") -> pd.DataFrame:
+    files = sorted(Path().glob(pattern))
+    if not files:
+        return pd.DataFrame(columns=["timestamp","duid","power_MW"])
+    df = pd.concat([pd.read_csv(f, parse_dates=["timestamp"]) for f in files], ignore_index=True)
+    # the same day can be present in several files (different DUID sets)
+    return df.drop_duplicates(["duid","timestamp"], keep="last").sort_values(["duid","timestamp"])
+
+def _history_matrix(hist: pd.DataFrame, duids: List[str]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Left-aligned (duid × row) matrix of the day's valid readings (forecast_next_day skips grid
+    gaps, so the EWMA sees exactly these), the per-duid counts, and the per-duid std of 5-min
+    deltas between adjacent valid grid intervals. Padding is NaN."""
+    grids = [on_grid(hist[hist["duid"] == d]) for d in duids]
+    groups = [g.dropna().to_numpy() for g in grids]
+    n = np.array([len(g) for g in groups])
+    P = np.full((len(duids), max(n.max(), 1)), np.nan)
+    for i, g in enumerate(groups):
+        P[i, :len(g)] = g
+    sd = np.array([float(g.diff().std(ddof=0)) if g.diff().notna().any() else 0.0 for g in grids])
+    return P, n, sd
+
+def forecast_grid(P: np.ndarray, n: np.ndarray, alphas: np.ndarray) -> np.ndarray:
+    """Closed form of forecast_next_day for every alpha at once -> (alpha × duid × N_NEXT).
+
+    forecast_series' last in-sample value is sum_j w_j p_j with w_0 = (1-a)^(n-2) and
+    w_j = a (1-a)^(n-2-j) for 1 <= j <= n-2; the horizon then decays geometrically to the
+    day mean: ph_k = mean + (1-a)^(k+1) (last_hat - mean).
+    """
+    a = alphas[:, None, None]
+    j = np.arange(P.shape[1])[None, None, :]
+    e = (n[None, :, None] - 2 - j).astype(float)
+    w = np.where(e >= 0, a * (1 - a) ** np.clip(e, 0, None), 0.0)
+    w[..., 0] = np.where(n[None, :] >= 2, (1 - alphas[:, None]) ** np.clip(n - 2, 0, None)[None, :], 1.0)
+    Pz = np.nan_to_num(P)
+    last_hat = np.einsum("adj,dj->ad", w, Pz)
+    mean = np.nanmean(P, axis=1)
+    k = np.arange(1, N_NEXT + 1)[None, None, :]
+    return mean[None, :, None] + (1 - a) ** k * (last_hat - mean[None, :])[:, :, None]
+
+def _dilate(mask: np.ndarray, tol: int) -> np.ndarray:
+    out = mask.copy()
+    for s in range(1, tol + 1):
+        out[..., s:] |= mask[..., :-s]
+        out[..., :-s] |= mask[..., s:]
+    return out
+
+def score_day(hist: pd.DataFrame, actual: pd.DataFrame, alphas: np.ndarray, sigmas: np.ndarray,
+              tol: int = 0) -> pd.DataFrame:
+    """Score one day's next-day forecast against the following day's actuals for the whole
+    (sigma × alpha × duid × interval) grid. Returns one row per (duid, alpha, sigma)."""
+    valid = hist[pd.to_numeric(hist["power_MW"], errors="coerce").notna()]
+    duids = sorted(set(valid["duid"]) & set(actual["duid"]))
+    if not duids:
+        return pd.DataFrame()
+    P, n, sd = _history_matrix(hist, duids)
+    day0 = hist["timestamp"].min().floor("D")
+    idx_next = pd.date_range(day0 + pd.Timedelta(days=1), periods=N_NEXT, freq="5min")
+    Y = (actual.pivot_table(index="timestamp", columns="duid", values="power_MW", aggfunc="last")
+               .reindex(index=idx_next, columns=duids).to_numpy().T)           # duid × k
+
+    F = forecast_grid(P, n, alphas)                                           # a × d × k
+    err = F - Y[None]
+    ok = ~np.isnan(Y)
+    cnt = ok.sum(-1)                                                          # d
+    mae = np.where(ok[None], np.abs(err), 0).sum(-1) / np.maximum(cnt, 1)
+    rmse = np.sqrt(np.where(ok[None], err**2, 0).sum(-1) / np.maximum(cnt, 1))
+
+    # ramp threshold = sigma × std of the history day's gridded 5-min deltas (per duid)
+    thr = sigmas[:, None] * sd[None, :]                                       # s × d
+    dph = np.abs(np.diff(F, axis=-1, prepend=F[..., :1]))                     # a × d × k
+    dy = np.abs(np.diff(Y, axis=-1, prepend=Y[:, :1]))                        # d × k
+    live = (thr > 0)[:, None, :, None]
+    pred = live & (dph[None] >= thr[:, None, :, None])                        # s × a × d × k
+    act = live & (np.nan_to_num(dy)[None, None] >= thr[:, None, :, None])
+    tp = (pred & _dilate(act, tol)).sum(-1)
+    fp = pred.sum(-1) - tp
+    fn = (act & ~_dilate(pred, tol)).sum(-1)
+
+    S, A, D = np.meshgrid(np.arange(len(sigmas)), np.arange(len(alphas)), np.arange(len(duids)), indexing="ij")
+    return pd.DataFrame({
+        "day": day0.strftime("%Y-%m-%d"),
+        "duid": np.array(duids)[D.ravel()],
+        "alpha": alphas[A.ravel()], "ramp_alert_sigma": sigmas[S.ravel()],
+        "n_actual": cnt[D.ravel()],
+        "mae": mae[A.ravel(), D.ravel()], "rmse": rmse[A.ravel(), D.ravel()],
+        "tp": tp.ravel(), "fp": fp.ravel(), "fn": fn.ravel(),
+    })
+
+def _score_pair(args) -> pd.DataFrame:
+    return score_day(*args)
+
+def backtest(df: pd.DataFrame, alphas: np.ndarray, sigmas: np.ndarray, tol: int = 0,
+             workers: int = 1) -> pd.DataFrame:
+    """Replay every day that has a following day of actuals; days are scored in parallel."""
+    day = df["timestamp"].dt.floor("D")
+    days = sorted(day.unique())
+    jobs = [(df[day == d0], df[day == d1], alphas, sigmas, tol)
+            for d0, d1 in zip(days[:-1], days[1:]) if d1 - d0 == pd.Timedelta(days=1)]
+    if not jobs:
+        return pd.DataFrame()
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            parts = list(ex.map(_score_pair, jobs))
+    else:
+        parts = [_score_pair(j) for j in jobs]
+    return pd.concat(parts, ignore_index=True)
+
+def _with_rates(g: pd.DataFrame) -> pd.DataFrame:
+    g["precision"] = g["tp"] / (g["tp"] + g["fp"]).replace(0, np.nan)
+    g["recall"] = g["tp"] / (g["tp"] + g["fn"]).replace(0, np.nan)
+    g["f1"] = 2 * g["precision"] * g["recall"] / (g["precision"] + g["recall"]).replace(0, np.nan)
+    return g
+
+def leaderboard(scores: pd.DataFrame, by: List[str] | None = None) -> pd.DataFrame:
+    """Aggregate per-day scores: MAE weighted by actual rows, RMSE pooled, counts summed."""
+    by = by or ["alpha", "ramp_alert_sigma"]
+    s = scores.assign(ae=scores["mae"] * scores["n_actual"], se=scores["rmse"]**2 * scores["n_actual"])
+    g = s.groupby(by, as_index=False).agg(days=("day","nunique"), n_actual=("n_actual","sum"),
+                                          ae=("ae","sum"), se=("se","sum"),
+                                          tp=("tp","sum"), fp=("fp","sum"), fn=("fn","sum"))
+    g["mae"] = g["ae"] / g["n_actual"].replace(0, np.nan)
+    g["rmse"] = np.sqrt(g["se"] / g["n_actual"].replace(0, np.nan))
+    g = _with_rates(g.drop(columns=["ae","se"]))
+    return g.sort_values(["mae","f1"], ascending=[True, False], na_position="last").reset_index(drop=True)
+
+def main():
+    d = ForecastConfig()
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--glob", default="data/aemo/aemo_*_*_5min.csv")
+    ap.add_argument("--alphas", default="0.05:0.95:0.05", help='"a,b,c" or "start:stop:step"')
+    ap.add_argument("--sigmas", default="1:3:0.5", help='"a,b,c" or "start:stop:step"')
+    ap.add_argument("--tolerance", type=int, default=0, help="ramp-alert match window (± intervals)")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--outdir", default="data/backtest")
+    args = ap.parse_args()
+
+    df = load_history(args.glob)
+    if df.empty:
+        raise SystemExit("No daily CSVs to backtest.")
+    alphas = np.union1d(parse_grid(args.alphas), [d.alpha])
+    sigmas = np.union1d(parse_grid(args.sigmas), [d.ramp_alert_sigma])
+    scores = backtest(df, alphas, sigmas, tol=args.tolerance, workers=args.workers)
+    if scores.empty:
+        raise SystemExit("Need at least two consecutive days of data to backtest.")
+
+    outdir = Path(args.outdir); outdir.mkdir(parents=True, exist_ok=True)
+    board = leaderboard(scores)
+    per_duid = leaderboard(scores, by=["duid","alpha","ramp_alert_sigma"])
+    board.to_csv(outdir / "leaderboard.csv", index=False)
+    per_duid.to_csv(outdir / "leaderboard_per_duid.csv", index=False)
+    scores.to_csv(outdir / "backtest_scores.csv", index=False)
+
+    cur = board[np.isclose(board["alpha"], d.alpha) & np.isclose(board["ramp_alert_sigma"], d.ramp_alert_sigma)]
+    print(f"Replayed {scores['day'].nunique()} day(s) × {len(alphas)} alpha × {len(sigmas)} sigma")
+    print("Top 5:\n" + board.head(5).to_string(index=False))
+    if not cur.empty:
+        print(f"Current default (alpha={d.alpha}, sigma={d.ramp_alert_sigma}) rank "
+              f"{cur.index[0] + 1}/{len(board)}: MAE={cur['mae'].iloc[0]:.3f}")
+    print(f"✅ wrote {outdir / 'leaderboard.csv'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+# src/bess_analytics.py
+from __future__ import annotations
+import argparse, os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Tuple
+import numpy as np
+import pandas as pd
+
+DT5H = 5.0/60.0
+DEFAULT_BESS_DUIDS: Tuple[str, ...] = ("CLUNY", "BUTLERSG")
+# depth-of-discharge histogram edges (fraction of capacity); last bin is open-ended
+DOD_BINS = np.round(np.linspace(0.0, 1.0, 11), 2)
+# rainflow ranges below this are counted as noise when no capacity is configured (MWh)
+NOISE_MWH = 0.01
+
+def _parse_capacities(spec: str) -> Dict[str, float]:
+    """'CLUNY=100,BUTLERSG=50' -> {'CLUNY': 100.0, 'BUTLERSG': 50.0}"""
+    out: Dict[str, float] = {}
+    for part in (spec or "").split(","):
+        if "=" not in part:
+            continue
+        k, v = part.split("=", 1)
+        out[k.strip().upper()] = float(v)
+    return out
+
+def _registry_bess() -> Tuple[str, ...]:
+    from src.duid_registry import bess_duids
+    return tuple(bess_duids()) or DEFAULT_BESS_DUIDS
+
+def _default_capacities() -> Dict[str, float]:
+    """storage_mwh from the DUID registry, overridden by BESS_CAPACITY_MWH."""
+    from src.duid_registry import load_registry
+    reg = load_registry().dropna(subset=["storage_mwh"])
+    caps = dict(zip(reg["duid"], reg["storage_mwh"].astype(float)))
+    caps.update(_parse_capacities(os.getenv("BESS_CAPACITY_MWH", "")))
+    return caps
+
+@dataclass
+class BessConfig:
+    # technology == BESS in the DUID registry (falls back to DEFAULT_BESS_DUIDS)
+    duids: Tuple[str, ...] = field(default_factory=_registry_bess)
+    # usable energy per DUID (MWh); DUIDs without an entry get NaN EFC / SoC / depth histogram
+    capacity_mwh: Dict[str, float] = field(default_factory=_default_capacities)
+    # losses are booked on the charging side of the implied energy trace
+    round_trip_efficiency: float = 0.85
+
+# ---------- energy / SoC ----------
+SOC_COLUMNS = ["timestamp", "duid", "day", "power_MW", "imputed", "energy_mwh", "soc_frac", "saturated"]
+
+def _gridded_bess(df: pd.DataFrame, cfg: BessConfig) -> pd.DataFrame:
+    """BESS rows on the 5-min NEM grid, one block per (duid, day) spanning its first to last
+    reading. Interior gaps are filled linearly between the neighbouring readings and flagged
+    `imputed`, so a one-hour gap is integrated as one hour rather than one interval."""
+    want = {d.upper() for d in cfg.duids}
+    sub = df[df["duid"].str.upper().isin(want)]
+    sub = sub.assign(power_MW=pd.to_numeric(sub["power_MW"], errors="coerce")).dropna(subset=["power_MW"])
+    if sub.empty:
+        return pd.DataFrame(columns=["timestamp", "duid", "day", "power_MW", "imputed"])
+    sub = sub.assign(day=sub["timestamp"].dt.strftime("%Y-%m-%d"))
+    span = sub.groupby(["duid", "day"], sort=True)["timestamp"].agg(["min", "max"])
+    span["min"] = span["min"].dt.ceil("5min")    # same lattice as completeness.nem_grid
+    n = ((span["max"] - span["min"]) // pd.Timedelta(minutes=5)).to_numpy() + 1
+    start = np.repeat(span["min"].to_numpy(), n)
+    k = np.arange(n.sum()) - np.repeat(np.cumsum(n) - n, n)
+    grid = pd.DataFrame({"timestamp": start + k * np.timedelta64(5, "m"),
+                         "duid": np.repeat(span.index.get_level_values(0), n),
+                         "day": np.repeat(span.index.get_level_values(1), n)})
+    # off-grid readings are dropped by the merge
+    g = grid.merge(sub.drop_duplicates(["duid", "timestamp"], keep="last")[["duid", "timestamp", "power_MW"]],
+                   on=["duid", "timestamp"], how="left")
+    g["imputed"] = g["power_MW"].isna()
+    # every block starts and ends on a reading, so interpolation never crosses blocks
+    g["power_MW"] = g["power_MW"].interpolate(limit_area="inside")
+    return g
+
+def _capacities(sub: pd.DataFrame, cfg: BessConfig) -> pd.Series:
+    """Configured capacity per DUID, NaN when none is set. There is deliberately no fallback:
+    a guess from the energy swing depends on how much history was loaded."""
+    duids = pd.Index(sub["duid"].unique())
+    cap = pd.Series([cfg.capacity_mwh.get(d.upper(), np.nan) for d in duids], index=duids, dtype=float)
+    return cap.where(cap > 0, np.nan)
+
+def implied_soc(df: pd.DataFrame, cfg: BessConfig | None = None) -> pd.DataFrame:
+    """Implied state-of-charge trace on the 5-min grid, anchored per (duid, day).
+
+    Stored energy integrates -power (negative SCADA MW = charging), with charging energy scaled
+    by the round-trip efficiency, and restarts every day at the day's lowest point: SCADA carries
+    no SoC, so without an anchor the running sum drifts and depends on how much history is loaded.
+    soc_frac = energy / capacity is therefore "charge above the day's low" and is not clipped;
+    `saturated` marks intervals where it exceeds 1 (the trace is inconsistent with the configured
+    capacity). soc_frac is NaN for DUIDs without a configured capacity.
+    """
+    cfg = cfg or BessConfig()
+    g = _gridded_bess(df, cfg)
+    if g.empty:
+        return pd.DataFrame(columns=SOC_COLUMNS)
+    p = g["power_MW"].to_numpy()
+    flow = np.where(p < 0, -p * cfg.round_trip_efficiency, -p) * DT5H
+    keys = [g["duid"], g["day"]]
+    e = pd.Series(flow, index=g.index).groupby(keys).cumsum()
+    e = e - e.groupby(keys).transform("min")
+    cap = g["duid"].map(_capacities(g, cfg))
+    soc = e / cap
+    return g.assign(energy_mwh=e.to_numpy(), soc_frac=soc.to_numpy(), saturated=(soc > 1.0).to_numpy())[SOC_COLUMNS]
+
+# ---------- rainflow ----------
+def _turning_points(x: np.ndarray, g: np.ndarray) -> np.ndarray:
+    """Indices of reversals in x, computed per group g (x sorted by group). Flats are skipped;
+    the first and last point of every group are always kept."""
+    n = len(x)
+    if n == 0:
+        return np.empty(0, dtype=np.int64)
+    s = np.sign(np.diff(x))
+    s[g[1:] != g[:-1]] = 0
+    nz = np.flatnonzero(s)
+    a, b = nz[:-1], nz[1:]
+    turn = a[(s[a] != s[b]) & (g[a] == g[b])] + 1
+    starts = np.flatnonzero(np.r_[True, g[1:] != g[:-1]])
+    ends = np.r_[starts[1:] - 1, n - 1]
+    return np.unique(np.concatenate([starts, ends, turn]))
+
+def rainflow_batched(x: np.ndarray, g: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Three-point (ASTM E1049) stack rainflow over many series at once.
+
+    x is the concatenation of all series, g their integer group codes (contiguous).
+    Returns (group, range, count) arrays, count being 1.0 for closed cycles and 0.5 for
+    residual half cycles. Runs in O(n) over reversals; the stack is reset at group edges.
+    """
+    x = np.asarray(x, dtype=float); g = np.asarray(g)
+    tp = _turning_points(x, g)
+    rv, rg = x[tp].tolist(), g[tp].tolist()
+    out_g, out_r, out_c = [], [], []
+    stack: list[float] = []
+    lo = 0  # bottom of the live stack (avoids O(n) pops from the front)
+
+    def flush(grp):
+        for i in range(lo, len(stack) - 1):
+            out_g.append(grp); out_r.append(abs(stack[i+1] - stack[i])); out_c.append(0.5)
+
+    cur = rg[0] if rg else None
+    for v, grp in zip(rv, rg):
+        if grp != cur:
+            flush(cur)
+            stack, lo, cur = [], 0, grp
+        stack.append(v)
+        while len(stack) - lo >= 3:
+            X = abs(stack[-1] - stack[-2]); Y = abs(stack[-2] - stack[-3])
+            if X < Y:
+                break
+            out_g.append(grp); out_r.append(Y)
+            if len(stack) - lo == 3:
+                out_c.append(0.5); lo += 1
+            else:
+                out_c.append(1.0); last = stack.pop(); del stack[-2:]; stack.append(last)
+    if cur is not None:
+        flush(cur)
+    return np.asarray(out_g, dtype=np.int64), np.asarray(out_r, dtype=float), np.asarray(out_c, dtype=float)
+
+# ---------- daily fleet stats ----------
+BESS_COLUMNS = ["duid", "day", "charge_mwh", "discharge_mwh", "capacity_mwh", "equiv_full_cycles",
+                "n_cycles", "soc_swing_frac", "soc_saturated", "imputed_intervals", "cycle_depth_hist"]
+
+def bess_daily_stats(df: pd.DataFrame, cfg: BessConfig | None = None) -> pd.DataFrame:
+    """One row per (duid, day): charge/discharge MWh, equivalent full cycles, rainflow cycle
+    count and depth-of-discharge histogram (counts per DOD_BINS bin), the day's SoC swing
+    (max - min of implied_soc; > 1 sets soc_saturated) and the number of gap intervals filled.
+    Every figure uses only that day's rows, so it does not depend on the loaded window.
+    EFC, histogram and swing are NaN for DUIDs without a configured capacity."""
+    cfg = cfg or BessConfig()
+    soc = implied_soc(df, cfg)
+    if soc.empty:
+        return pd.DataFrame(columns=BESS_COLUMNS)
+    p = soc["power_MW"]
+    keys = [soc["duid"], soc["day"]]
+    gcode = soc.groupby(keys, sort=True).ngroup().to_numpy()
+
+    agg = pd.DataFrame({
+        "charge_mwh": (-p.clip(upper=0) * DT5H).groupby(keys).sum(),
+        "discharge_mwh": (p.clip(lower=0) * DT5H).groupby(keys).sum(),
+        "soc_swing_frac": soc["soc_frac"].groupby(keys).max(),
+        "imputed_intervals": soc["imputed"].groupby(keys).sum().astype(int),
+    })
+    agg["soc_saturated"] = agg["soc_swing_frac"] > 1.0
+    cap_by_duid = _capacities(soc, cfg)
+    agg["capacity_mwh"] = cap_by_duid.reindex(agg.index.get_level_values(0)).to_numpy()
+    agg["equiv_full_cycles"] = agg["discharge_mwh"] / agg["capacity_mwh"]
+
+    cg, cr, cc = rainflow_batched(soc["energy_mwh"].to_numpy(), gcode)
+    nb = len(DOD_BINS) - 1
+    cap = agg["capacity_mwh"].to_numpy()
+    depth = cr / cap[cg] if len(cg) else cr
+    b = np.clip(np.digitize(np.nan_to_num(depth), DOD_BINS) - 1, 0, nb - 1)
+    hist = np.zeros((len(agg), nb))
+    np.add.at(hist, (cg, b), cc)
+    hist[np.isnan(cap)] = np.nan
+    # ignore numerical-noise "cycles" (below 0.1% depth, or NOISE_MWH without a capacity)
+    real = np.where(np.isnan(depth), cr > NOISE_MWH, depth > 1e-3)
+    agg["n_cycles"] = np.bincount(cg[real], weights=cc[real], minlength=len(agg))
+    agg["cycle_depth_hist"] = [list(map(float, h)) for h in hist]
+
+    out = agg.reset_index()
+    out.columns = ["duid", "day"] + list(out.columns[2:])
+    return out[BESS_COLUMNS]
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--glob", default="data/aemo/aemo_*_*_5min.csv", help="Daily CSVs to analyze")
+    ap.add_argument("--duids", default=",".join(_registry_bess()), help="Comma list of BESS DUIDs")
+    ap.add_argument("--capacity", default=os.getenv("BESS_CAPACITY_MWH", ""),
+                    help='Usable capacity per DUID, e.g. "CLUNY=100,BUTLERSG=50" (MWh)')
+    ap.add_argument("--efficiency", type=float, default=BessConfig.round_trip_efficiency,
+                    help="Round-trip efficiency applied to charging energy")
+    ap.add_argument("--out", default="data/reports/bess_daily.csv")
+    args = ap.parse_args()
+
+    files = sorted(Path().glob(args.glob))
+    if not files:
+        raise SystemExit(f"No CSVs match {args.glob}.")
+    df = pd.concat([pd.read_csv(f, parse_dates=["timestamp"]) for f in files], ignore_index=True)
+    df = df.drop_duplicates(["duid", "timestamp"])
+    cfg = BessConfig(duids=tuple(d.strip().upper() for d in args.duids.split(",") if d.strip()),
+                     capacity_mwh={**_default_capacities(), **_parse_capacities(args.capacity)},
+                     round_trip_efficiency=args.efficiency)
+    stats = bess_daily_stats(df, cfg)
+    out = Path(args.out); out.parent.mkdir(parents=True, exist_ok=True)
+    stats.to_csv(out, index=False)
+    print(f"✅ wrote {out} rows={len(stats):,}")
+
+if __name__ == "__main__":
+    main()
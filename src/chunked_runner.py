@@ -0,0 +1,179 @@
+# src/chunked_runner.py
+"""Out-of-core runs over many daily CSVs (e.g. a year of `--duids "*"` history).
+
+Daily files are written sorted by (duid, timestamp), so each file is streamed with
+`pd.read_csv(chunksize=...)` and re-cut at DUID boundaries: every chunk holds complete
+DUID-days and the per-DUID tools (summarize_day, forecast_next_day) run on it unchanged.
+Partial results are keyed by (day, duid) and merged at the end, so peak memory is bounded by
+the chunk size derived from --max-mb, not by the size of the history.
+
+    python -m src.chunked_runner summarize --max-mb 256
+    python -m src.chunked_runner forecast  --max-mb 256
+    python -m src.chunked_runner history   --max-mb 256 --out data/reports/history_stats.csv
+"""
+from __future__ import annotations
+import argparse, re
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Tuple
+import numpy as np
+import pandas as pd
+
+DEFAULT_GLOB = "data/aemo/aemo_*_*_5min.csv"
+# working copies made by the analysis steps (sorts, diffs, rolling windows) on top of the raw chunk
+WORK_FACTOR = 4.0
+# a chunk never splits a DUID-day, so it cannot be smaller than one day on the 5-min grid
+MIN_CHUNK_ROWS = 288
+_DAY_RE = re.compile(r"aemo_(\d{4}-\d{2}-\d{2})_")
+READ_KW = dict(parse_dates=["timestamp"], dtype={"duid": str, "power_MW": "float64"})
+
+def files_by_day(pattern: str = DEFAULT_GLOB) -> Dict[str, List[Path]]:
+    """Group daily CSVs by the day in their name; later files (sorted) win on duplicate DUIDs."""
+    out: Dict[str, List[Path]] = defaultdict(list)
+    for f in sorted(Path().glob(pattern)):
+        m = _DAY_RE.search(f.name)
+        if m:
+            out[m.group(1)].append(f)
+    return dict(sorted(out.items()))
+
+def rows_for_budget(path: Path, max_mb: float) -> int:
+    """Rows per chunk so that a chunk plus its working copies stays under max_mb.
+    Raises ValueError when max_mb cannot hold MIN_CHUNK_ROWS (one complete DUID-day)."""
+    sample = pd.read_csv(path, nrows=5000, **READ_KW)
+    if sample.empty:
+        return 10_000
+    bpr = sample.memory_usage(deep=True, index=True).sum() / len(sample)
+    rows = int(max_mb * 2**20 / (bpr * WORK_FACTOR))
+    if rows < MIN_CHUNK_ROWS:
+        need = MIN_CHUNK_ROWS * bpr * WORK_FACTOR / 2**20
+        raise ValueError(f"--max-mb {max_mb:g} is below one DUID-day for {path.name}; use at least {need:.2f}.")
+    return rows
+
+def iter_duid_chunks(path: Path, rows: int) -> Iterator[pd.DataFrame]:
+    """Stream a (duid, timestamp)-sorted CSV as chunks of complete DUIDs, ~rows each."""
+    carry, seen = None, set()
+    for chunk in pd.read_csv(path, chunksize=rows, **READ_KW):
+        if carry is not None:
+            chunk = pd.concat([carry, chunk], ignore_index=True)
+        tail = chunk["duid"].eq(chunk["duid"].iloc[-1])
+        head, carry = chunk[~tail], chunk[tail]
+        if not head.empty:
+            new = set(head["duid"].unique())
+            if new & seen or len(new) != head["duid"].ne(head["duid"].shift()).sum():
+                raise ValueError(f"{path.name} is not sorted by duid; re-export it sorted.")
+            seen |= new
+            yield head
+    if carry is not None and not carry.empty:
+        yield carry
+
+def iter_partitions(pattern: str = DEFAULT_GLOB, max_mb: float = 512.0
+                    ) -> Iterator[Tuple[str, pd.DataFrame]]:
+    """(day, chunk) pairs over the whole history, each chunk within the memory budget."""
+    for day, files in files_by_day(pattern).items():
+        for f in files:
+            rows = rows_for_budget(f, max_mb)
+            for chunk in iter_duid_chunks(f, rows):
+                yield day, chunk
+
+# ---------- mergeable partial stats ----------
+STAT_COLS = ["n", "sum", "sumsq", "min", "max", "n_zero", "n_neg", "ramp_max", "charge_mwh", "discharge_mwh"]
+
+def partial_stats(chunk: pd.DataFrame) -> pd.DataFrame:
+    """Per-DUID additive/min/max moments for one chunk (complete DUID-days)."""
+    p = chunk["power_MW"]
+    g = chunk.assign(sq=p**2, zero=(p == 0), neg=(p < 0),
+                     ramp=chunk.groupby("duid")["power_MW"].diff().abs(),
+                     chg=-p.clip(upper=0) * 5/60, dis=p.clip(lower=0) * 5/60).groupby("duid")
+    out = pd.DataFrame({
+        "n": g["power_MW"].count(), "sum": g["power_MW"].sum(), "sumsq": g["sq"].sum(),
+        "min": g["power_MW"].min(), "max": g["power_MW"].max(),
+        "n_zero": g["zero"].sum(), "n_neg": g["neg"].sum(), "ramp_max": g["ramp"].max(),
+        "charge_mwh": g["chg"].sum(), "discharge_mwh": g["dis"].sum(),
+    })
+    return out[STAT_COLS]
+
+def merge_stats(parts: Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """Combine partials from any chunking into per-DUID history stats."""
+    allp = pd.concat(list(parts))
+    if allp.empty:
+        return pd.DataFrame(columns=["duid"] + STAT_COLS)
+    g = allp.groupby(level=0)
+    m = g[["n", "sum", "sumsq", "n_zero", "n_neg", "charge_mwh", "discharge_mwh"]].sum()
+    m["min"] = g["min"].min(); m["max"] = g["max"].max(); m["ramp_max"] = g["ramp_max"].max()
+    m["mean"] = m["sum"] / m["n"]
+    m["std"] = np.sqrt(np.clip(m["sumsq"] / m["n"] - m["mean"]**2, 0, None))
+    m["energy_mwh"] = m["sum"] * 5/60
+    m.index.name = "duid"
+    return m.reset_index()
+
+# ---------- commands ----------
+def run_summarize(pattern: str, max_mb: float, outdir: Path) -> None:
+    from src.agent_summary import summarize_day
+    from src.analyze_aemo_day import write_report
+    from src.bess_analytics import BessConfig
+    bess = BessConfig()    # reads the registry once, not per chunk
+    for day, files in files_by_day(pattern).items():
+        sums = {}
+        for f in files:
+            for chunk in iter_duid_chunks(f, rows_for_budget(f, max_mb)):
+                sums.update(summarize_day(chunk, bess))
+        md_path, _ = write_report(dict(sorted(sums.items())), outdir, day)
+        print(f"✅ wrote {md_path} duids={len(sums):,}")
+
+def run_forecast(pattern: str, max_mb: float, outdir: Path, alpha: float, sigma: float) -> None:
+    from src.agent_forecast import ForecastConfig, forecast_next_day
+    cfg = ForecastConfig(alpha=alpha, ramp_alert_sigma=sigma)
+    outdir.mkdir(parents=True, exist_ok=True)
+    for day, files in files_by_day(pattern).items():
+        fc: Dict[str, pd.DataFrame] = {}; ra: Dict[str, pd.DataFrame] = {}
+        for f in files:
+            for chunk in iter_duid_chunks(f, rows_for_budget(f, max_mb)):
+                fdf, rdf = forecast_next_day(chunk, cfg)
+                for d, sub in fdf.groupby("duid"): fc[d] = sub
+                for d in chunk["duid"].unique(): ra[d] = rdf[rdf["duid"] == d]
+        f_csv = outdir / f"forecast_{day}_nextday.csv"
+        r_csv = outdir / f"ramp_alerts_{day}_nextday.csv"
+        empty_f = pd.DataFrame(columns=["timestamp","duid","power_hat_MW"])
+        empty_r = pd.DataFrame(columns=["timestamp","duid","predicted_ramp_MW"])
+        pd.concat([empty_f, *fc.values()], ignore_index=True).to_csv(f_csv, index=False)
+        pd.concat([empty_r, *ra.values()], ignore_index=True).to_csv(r_csv, index=False)
+        print(f"✅ wrote {f_csv} duids={len(fc):,}")
+
+def run_history(pattern: str, max_mb: float, out: Path) -> pd.DataFrame:
+    parts = [partial_stats(chunk).assign(day=day) for day, chunk in iter_partitions(pattern, max_mb)]
+    if not parts:
+        raise SystemExit("No rows in history.")
+    # later files win for a (day, duid) present twice; partials are tiny (one row per DUID-day)
+    allp = pd.concat(parts).rename_axis("duid").reset_index()
+    allp = allp.drop_duplicates(["day", "duid"], keep="last")
+    stats = merge_stats([allp.set_index("duid")[STAT_COLS]])
+    out.parent.mkdir(parents=True, exist_ok=True)
+    stats.to_csv(out, index=False)
+    print(f"✅ wrote {out} duids={len(stats):,} days={allp['day'].nunique():,}")
+    return stats
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("command", choices=["summarize", "forecast", "history"])
+    ap.add_argument("--glob", default=DEFAULT_GLOB)
+    ap.add_argument("--max-mb", type=float, default=512.0, help="memory ceiling per chunk (MB); must hold one DUID-day (288 rows)")
+    ap.add_argument("--outdir", help="default: data/reports (summarize) or data/forecast (forecast)")
+    ap.add_argument("--out", default="data/reports/history_stats.csv", help="history output CSV")
+    ap.add_argument("--alpha", type=float, default=0.3)
+    ap.add_argument("--ramp_sigma", type=float, default=2.0)
+    args = ap.parse_args()
+
+    if not files_by_day(args.glob):
+        raise SystemExit(f"No daily CSVs match {args.glob}.")
+    try:
+        if args.command == "summarize":
+            run_summarize(args.glob, args.max_mb, Path(args.outdir or "data/reports"))
+        elif args.command == "forecast":
+            run_forecast(args.glob, args.max_mb, Path(args.outdir or "data/forecast"), args.alpha, args.ramp_sigma)
+        else:
+            run_history(args.glob, args.max_mb, Path(args.out))
+    except ValueError as e:
+        raise SystemExit(str(e))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# src/completeness.py
+from __future__ import annotations
+import argparse
+from pathlib import Path
+from typing import Tuple
+import numpy as np
+import pandas as pd
+from src.data_store import latest_file
+
+INTERVALS_PER_DAY = 288
+
+def nem_grid(day: str | pd.Timestamp) -> pd.DatetimeIndex:
+    """The day's 5-min SETTLEMENTDATE grid (00:00 … 23:55), as used by forecast_next_day."""
+    return pd.date_range(pd.Timestamp(day).floor("D"), periods=INTERVALS_PER_DAY, freq="5min")
+
+def nem_now() -> pd.Timestamp:
+    # NEM time is AEST (UTC+10) all year round
+    return pd.Timestamp.now(tz="UTC").tz_localize(None) + pd.Timedelta(hours=10)
+
+def grid_matrix(df: pd.DataFrame, day: str | None = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Reindex every DUID onto the grid. Returns (values interval × duid, gap mask) — gaps are
+    intervals with no row (or a NaN value). Intervals still in the future are not gaps."""
+    day = day or df["timestamp"].min().strftime("%Y-%m-%d")
+    grid = nem_grid(day)
+    grid = grid[grid <= nem_now()]
+    wide = (df.pivot_table(index="timestamp", columns="duid", values="power_MW", aggfunc="last", dropna=False)
+              .reindex(index=grid, columns=sorted(df["duid"].unique())))
+    return wide, wide.isna()
+
+def _fmt_runs(ts: pd.DatetimeIndex, starts: np.ndarray, ends: np.ndarray) -> str:
+    return ";".join(f"{ts[a]:%H:%M}" if a == b else f"{ts[a]:%H:%M}-{ts[b]:%H:%M}" for a, b in zip(starts, ends))
+
+def coverage_stats(mask: pd.DataFrame) -> pd.DataFrame:
+    """Per-DUID coverage from a gap mask: expected/present rows, gap run count and length,
+    plus the gaps as compact HH:MM ranges."""
+    m = mask.to_numpy().astype(np.int8)
+    n_t, n_d = m.shape
+    pad = np.zeros((1, n_d), dtype=np.int8)
+    d = np.diff(np.vstack([pad, m, pad]), axis=0).T          # duid × (t+1)
+    sc, st = np.nonzero(d == 1)                               # sorted by duid, then time
+    ec, en = np.nonzero(d == -1)
+    length = en - st
+    longest = np.zeros(n_d, dtype=int)
+    np.maximum.at(longest, sc, length)
+    n_gaps = np.bincount(sc, minlength=n_d)
+    present = n_t - m.sum(axis=0)
+    gaps = [_fmt_runs(mask.index, st[sc == i], en[sc == i] - 1) for i in range(n_d)]
+    return pd.DataFrame({
+        "duid": mask.columns, "expected": n_t, "present": present,
+        "coverage": present / max(n_t, 1), "n_gaps": n_gaps, "longest_gap": longest, "gaps": gaps,
+    })
+
+def missing_pairs(mask: pd.DataFrame) -> pd.DataFrame:
+    s = mask.stack()
+    s = s[s]
+    return s.index.to_frame(index=False, name=["timestamp", "duid"])
+
+def refetch_missing(mask: pd.DataFrame, source: str = "auto", sess=None) -> pd.DataFrame:
+    """Download only the interval zips for missing timestamps (CURRENT first, then ranges out of
+    the ARCHIVE daily zip) and return the rows that fill a gap."""
+    from src.aemo_banner import make_session, fetch_current_intervals_df, fetch_archive_intervals_df
+    need = missing_pairs(mask)
+    if need.empty:
+        return pd.DataFrame(columns=["timestamp", "duid", "power_MW"])
+    sess = sess or make_session()
+    stamps = set(need["timestamp"].dt.strftime("%Y%m%d%H%M"))
+    got = []
+    if source in ("auto", "current"):
+        df = fetch_current_intervals_df(stamps, sess)
+        if not df.empty:
+            got.append(df); stamps -= set(df["timestamp"].dt.strftime("%Y%m%d%H%M"))
+    if stamps and source in ("auto", "archive"):
+        # ARCHIVE days run on the market day (04:05 → 04:00), so early intervals sit in the previous file
+        ts = pd.to_datetime(sorted(stamps), format="%Y%m%d%H%M")
+        for day in sorted(set((ts - pd.Timedelta(hours=4, minutes=5)).strftime("%Y%m%d")) | set(ts.strftime("%Y%m%d"))):
+            df = fetch_archive_intervals_df(day, stamps, sess)
+            if not df.empty:
+                got.append(df); stamps -= set(df["timestamp"].dt.strftime("%Y%m%d%H%M"))
+            if not stamps:
+                break
+    if not got:
+        return pd.DataFrame(columns=["timestamp", "duid", "power_MW"])
+    fetched = pd.concat(got, ignore_index=True)
+    return fetched.merge(need, on=["timestamp", "duid"], how="inner").drop_duplicates(["timestamp", "duid"])
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--file", help="aemo_YYYY-MM-DD_*.csv (if omitted uses newest in data/aemo)")
+    ap.add_argument("--outdir", default="data/reports", help="where coverage_YYYY-MM-DD.csv goes")
+    ap.add_argument("--repair", action="store_true", help="re-fetch missing intervals and patch the file")
+    ap.add_argument("--source", choices=["auto","archive","current"], default="auto")
+    ap.add_argument("--fleet-outdir", default="data/fleet",
+                    help="fleet_YYYY-MM-DD.csv to rewrite after repairing a REGISTRY file")
+    args = ap.parse_args()
+
+    if args.file:
+        f = Path(args.file)
+    else:
+        f = latest_file("data/aemo", "aemo_*_*_5min.csv")
+        if f is None:
+            raise SystemExit("No daily CSVs in data/aemo.")
+
+    df = pd.read_csv(f, parse_dates=["timestamp"])
+    day = df["timestamp"].min().strftime("%Y-%m-%d")
+    _, mask = grid_matrix(df, day)
+    n_missing = int(mask.to_numpy().sum())
+    print(f"{f.name}: {n_missing} missing DUID-intervals across {int(mask.any(axis=1).sum())} interval(s)")
+
+    if args.repair and n_missing:
+        patch = refetch_missing(mask, source=args.source)
+        if not patch.empty:
+            # patch first so it replaces rows that were present but NaN
+            df = (pd.concat([patch[["timestamp","duid","power_MW"]], df], ignore_index=True)
+                    .drop_duplicates(["duid","timestamp"], keep="first").sort_values(["duid","timestamp"]))
+            df.to_csv(f, index=False)
+            print(f"✅ patched {len(patch):,} rows into {f}")
+            # fleet aggregates were materialized at fetch time from the unpatched rows
+            if "_REGISTRY_" in f.name:
+                from src.duid_registry import write_fleet
+                print(f"✅ rewrote {write_fleet(df, args.fleet_outdir)}")
+        else:
+            print(f"⚠️ repair fetched no rows for the {n_missing} missing DUID-intervals ({args.source}); "
+                  f"{f.name} left unchanged")
+        _, mask = grid_matrix(df, day)
+
+    stats = coverage_stats(mask)
+    outdir = Path(args.outdir); outdir.mkdir(parents=True, exist_ok=True)
+    out = outdir / f"coverage_{day}.csv"
+    stats.to_csv(out, index=False)
+    print(f"✅ wrote {out} min coverage={stats['coverage'].min():.3f}")
+
+if __name__ == "__main__":
+    main()
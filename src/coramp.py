@@ -0,0 +1,171 @@
+# src/coramp.py
+"""Cross-DUID co-ramp statistics, kept as running sums over ingested days.
+
+For each day the 5-min deltas are pivoted to a (interval × DUID) matrix X (missing → 0) with
+validity mask M, and ramp indicators U / Dn (delta ≥ +thr / ≤ -thr, thr = ramp_sigma × the DUID's
+delta std that day, floored at min_ramp_mw). One product
+
+    [X | X² | M | U | Dn]ᵀ · [X | M | U | Dn]
+
+yields every pairwise sum needed for the pairwise-complete covariance of the deltas, plus
+same-direction (UᵀU + DnᵀDn) and opposite-direction (UᵀDn + DnᵀU) co-ramp counts.
+
+Each day's sums go to data/coramp/coramp_<day>.npz and are added into data/coramp/coramp_state.npz;
+re-ingesting a day swaps its old contribution for the new one.
+
+    python -m src.coramp                      # backfill every data/aemo day
+"""
+from __future__ import annotations
+import argparse
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List
+import numpy as np
+import pandas as pd
+
+CORAMP_DIR = Path("data/coramp")
+STATE_NAME = "coramp_state.npz"
+# pairwise sums kept per (row DUID i, column DUID j)
+BLOCKS = ("n", "sx", "sxx", "sxy", "co_same", "co_opp")
+# partners per DUID kept in report_*.json (the full matrix stays in coramp_state.npz)
+REPORT_TOP_K = 10
+
+@dataclass
+class CorampConfig:
+    ramp_sigma: float = 2.0     # same convention as ForecastConfig.ramp_alert_sigma
+    min_ramp_mw: float = 1.0    # ignore "ramps" on flat units
+
+def day_sums(df: pd.DataFrame, cfg: CorampConfig | None = None) -> tuple[List[str], Dict[str, np.ndarray]]:
+    """Pairwise sums for one day of timestamp/duid/power_MW rows (deltas never span files/days)."""
+    cfg = cfg or CorampConfig()
+    P = (df.assign(power_MW=pd.to_numeric(df["power_MW"], errors="coerce"))
+           .pivot_table(index="timestamp", columns="duid", values="power_MW", aggfunc="last")
+           .sort_index())
+    P = P.reindex(pd.date_range(P.index.min(), P.index.max(), freq="5min")) if len(P) else P
+    dX = P.diff().to_numpy()[1:]
+    duids = [str(d) for d in P.columns]
+    M = ~np.isnan(dX)
+    X = np.where(M, dX, 0.0)
+    thr = np.maximum(cfg.ramp_sigma * pd.DataFrame(dX).std(ddof=0).to_numpy(), cfg.min_ramp_mw)
+    U, Dn = (X >= thr) & M, (X <= -thr) & M
+    D = len(duids)
+    Mf, Uf, Df = M.astype(float), U.astype(float), Dn.astype(float)
+    G = np.hstack([X, X * X, Mf, Uf, Df]).T @ np.hstack([X, Mf, Uf, Df])
+    b = lambda r, c: G[r*D:(r+1)*D, c*D:(c+1)*D]
+    sums = {
+        "sxy": b(0, 0), "sx": b(0, 1), "sxx": b(1, 1), "n": b(2, 1),
+        "co_same": b(3, 2) + b(4, 3), "co_opp": b(3, 3) + b(4, 2),
+    }
+    return duids, {k: np.ascontiguousarray(v) for k, v in sums.items()}
+
+# ---------- persistence ----------
+def _load(path: Path) -> tuple[List[str], Dict[str, np.ndarray], List[str]]:
+    with np.load(path, allow_pickle=False) as z:
+        days = [str(d) for d in z["days"]] if "days" in z else []
+        return [str(d) for d in z["duids"]], {k: z[k] for k in BLOCKS}, days
+
+def _save(path: Path, duids: List[str], sums: Dict[str, np.ndarray], days: List[str] | None = None):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    extra = {"days": np.asarray(sorted(days), dtype=str)} if days is not None else {}
+    np.savez_compressed(path, duids=np.asarray(duids, dtype=str), **sums, **extra)
+
+def _align(duids: List[str], sums: Dict[str, np.ndarray], target: List[str]) -> Dict[str, np.ndarray]:
+    """Re-index square blocks onto a (super)set of DUIDs, zero-filling new rows/columns."""
+    at = {d: i for i, d in enumerate(target)}
+    pos = np.array([at[d] for d in duids], dtype=int)
+    out = {}
+    for k, v in sums.items():
+        a = np.zeros((len(target), len(target)))
+        a[np.ix_(pos, pos)] = v
+        out[k] = a
+    return out
+
+def update_state(df: pd.DataFrame, day: str, outdir: str | Path = CORAMP_DIR,
+                 cfg: CorampConfig | None = None) -> Path:
+    """Add one ingested day to the running sums (replacing that day's earlier contribution)."""
+    outdir = Path(outdir)
+    state_p, day_p = outdir / STATE_NAME, outdir / f"coramp_{day}.npz"
+    duids, sums = day_sums(df, cfg)
+    s_duids, state, days = _load(state_p) if state_p.exists() else ([], {k: np.zeros((0, 0)) for k in BLOCKS}, [])
+    old = _load(day_p)[:2] if day_p.exists() and day in days else None
+    union = sorted(set(s_duids) | set(duids))
+    state = _align(s_duids, state, union)
+    new = _align(duids, sums, union)
+    if old is not None:
+        prev = _align(old[0], old[1], union)
+        new = {k: new[k] - prev[k] for k in BLOCKS}
+    state = {k: state[k] + new[k] for k in BLOCKS}
+    _save(day_p, duids, sums)
+    _save(state_p, union, state, sorted(set(days) | {day}))
+    return state_p
+
+def load_matrix(path: str | Path = CORAMP_DIR / STATE_NAME, min_n: int = 12) -> pd.DataFrame:
+    """Long form of the running state: duid_a, duid_b, n, corr, cov, co_same, co_opp.
+    corr / cov use pairwise-complete deltas and are NaN for pairs with fewer than min_n."""
+    duids, s, _ = _load(Path(path))
+    n = s["n"]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mx, my = s["sx"] / n, s["sx"].T / n
+        cov = (s["sxy"] - n * mx * my) / (n - 1)
+        vx = (s["sxx"] - n * mx**2) / (n - 1)
+        vy = (s["sxx"].T - n * my**2) / (n - 1)
+        corr = np.clip(cov / np.sqrt(vx * vy), -1.0, 1.0)
+    bad = n < min_n
+    cov[bad] = np.nan; corr[bad] = np.nan
+    A, B = np.meshgrid(np.arange(len(duids)), np.arange(len(duids)), indexing="ij")
+    d = np.asarray(duids)
+    return pd.DataFrame({"duid_a": d[A.ravel()], "duid_b": d[B.ravel()], "n": n.ravel().astype(int),
+                         "corr": corr.ravel(), "cov": cov.ravel(),
+                         "co_same": s["co_same"].ravel().astype(int), "co_opp": s["co_opp"].ravel().astype(int)})
+
+def report_rows(mat: pd.DataFrame, duids=None, top_k: int = REPORT_TOP_K) -> Dict[str, List[dict]]:
+    """Top-k partners per DUID for the report JSON, strongest |corr| first (ties and pairs without
+    enough overlap ranked by co-ramp count): {duid: [{duid, corr, n, co_same, co_opp}, …]}.
+    Keeps the report O(D·k); the full matrix stays in coramp_state.npz."""
+    off = mat[mat["duid_a"] != mat["duid_b"]]
+    if duids is not None:
+        off = off[off["duid_a"].isin(list(duids))]
+    off = off.assign(_r=off["corr"].abs().fillna(-1.0), _c=off["co_same"] + off["co_opp"])
+    top = off.sort_values(["duid_a", "_r", "_c"], ascending=[True, False, False]).groupby("duid_a").head(top_k)
+    out: Dict[str, List[dict]] = {}
+    for r in top.itertuples(index=False):
+        out.setdefault(r.duid_a, []).append({
+            "duid": r.duid_b, "corr": None if pd.isna(r.corr) else round(float(r.corr), 4),
+            "n": int(r.n), "co_same": int(r.co_same), "co_opp": int(r.co_opp)})
+    return out
+
+def coramp_markdown(mat: pd.DataFrame, days: int, top: int = 5) -> str:
+    pairs = mat[(mat["duid_a"] < mat["duid_b"]) & mat["corr"].notna()]
+    if pairs.empty:
+        return ""
+    pairs = pairs.reindex(pairs["corr"].abs().sort_values(ascending=False).index).head(top)
+    items = [f"{r.duid_a}/{r.duid_b} ρ **{r.corr:+.2f}** (co-ramps same/opp {r.co_same}/{r.co_opp})"
+             for r in pairs.itertuples(index=False)]
+    return f"## Co-ramp (5-min deltas, {days} day(s))\n- " + "\n- ".join(items) + "\n"
+
+def state_days(path: str | Path = CORAMP_DIR / STATE_NAME) -> List[str]:
+    return _load(Path(path))[2]
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--glob", default="data/aemo/aemo_*_*_5min.csv", help="Daily CSVs to fold in")
+    ap.add_argument("--outdir", default=str(CORAMP_DIR))
+    ap.add_argument("--ramp_sigma", type=float, default=2.0)
+    ap.add_argument("--min_ramp_mw", type=float, default=1.0)
+    args = ap.parse_args()
+    files = sorted(Path().glob(args.glob))
+    if not files:
+        raise SystemExit(f"No CSVs match {args.glob}.")
+    cfg = CorampConfig(ramp_sigma=args.ramp_sigma, min_ramp_mw=args.min_ramp_mw)
+    by_day: Dict[str, list] = {}
+    for f in files:
+        df = pd.read_csv(f, parse_dates=["timestamp"])
+        by_day.setdefault(df["timestamp"].min().strftime("%Y-%m-%d"), []).append(df)
+    for day, dfs in sorted(by_day.items()):
+        df = pd.concat(dfs, ignore_index=True).drop_duplicates(["duid","timestamp"], keep="last")
+        state = update_state(df, day, args.outdir, cfg)
+    mat = load_matrix(state)
+    print(f"✅ wrote {state} days={len(state_days(state))} duids={mat['duid_a'].nunique()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# src/data_store.py
+"""Shared file lookup and decoded-frame cache for everything that reads data/."""
+from __future__ import annotations
+import hashlib, json, re, threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Tuple
+import pandas as pd
+
+DATA_ROOT = Path("data")
+# the day is followed by "_" (aemo_<day>_<duids>_5min.csv) or the extension (report_<day>.json)
+_DAY_RE = re.compile(r"_(\d{4}-\d{2}-\d{2})[_.]")
+
+def latest_file(folder: str | Path, pattern: str) -> Path | None:
+    """Newest file by name (names embed YYYY-MM-DD, so lexical order is date order)."""
+    folder = Path(folder)
+    cand = sorted(folder.glob(pattern)) if folder.exists() else []
+    return cand[-1] if cand else None
+
+def file_day(p: Path) -> str | None:
+    m = _DAY_RE.search(Path(p).name)
+    return m.group(1) if m else None
+
+def files_in_range(folder: str | Path, pattern: str, start: str | None = None,
+                   end: str | None = None) -> List[Path]:
+    out = []
+    for f in sorted(Path(folder).glob(pattern)):
+        d = file_day(f)
+        if d and ((start and d < start) or (end and d > end)):
+            continue
+        out.append(f)
+    return out
+
+def fingerprint(p: Path) -> Tuple[str, int, int]:
+    s = p.stat()
+    return str(p), s.st_mtime_ns, s.st_size
+
+def etag_for(files: Iterable[Path], *extra) -> str:
+    """Strong validator from the files' (path, mtime, size) plus any request parameters."""
+    h = hashlib.sha1()
+    for f in files:
+        h.update(repr(fingerprint(f)).encode())
+    h.update(repr(extra).encode())
+    return '"' + h.hexdigest()[:20] + '"'
+
+def approx_nbytes(val) -> int:
+    """Memory held by a cached value: deep frame usage, buffer length, or encoded JSON size."""
+    if isinstance(val, pd.DataFrame):
+        return int(val.memory_usage(deep=True, index=True).sum())
+    if isinstance(val, (bytes, bytearray, str)):
+        return len(val)
+    if isinstance(val, (tuple, list)):
+        return sum(approx_nbytes(v) for v in val)
+    return len(json.dumps(val, default=str))
+
+class LRUCache:
+    """Thread-safe LRU with single-flight loads: concurrent misses on one key load it once.
+    Bounded by entry count and, when max_bytes is set, by approx_nbytes of the values; a value
+    larger than max_bytes on its own is returned without being cached."""
+    def __init__(self, max_items: int = 64, max_bytes: int | None = None,
+                 sizeof: Callable[[object], int] = approx_nbytes):
+        self.max_items, self.max_bytes, self.sizeof = max_items, max_bytes, sizeof
+        self._d: "OrderedDict[object, object]" = OrderedDict()
+        self._sizes: Dict[object, int] = {}
+        self.nbytes = 0
+        self._lock = threading.Lock()
+        self._loading: Dict[object, threading.Lock] = {}
+        self.hits = self.misses = 0
+
+    def get(self, key, loader: Callable[[], object]):
+        with self._lock:
+            if key in self._d:
+                self._d.move_to_end(key); self.hits += 1
+                return self._d[key]
+            klock = self._loading.setdefault(key, threading.Lock())
+        with klock:
+            try:
+                with self._lock:
+                    if key in self._d:          # another thread loaded it while we waited
+                        self._d.move_to_end(key); self.hits += 1
+                        return self._d[key]
+                val = loader()
+                size = self.sizeof(val) if self.max_bytes is not None else 0
+                with self._lock:
+                    self.misses += 1
+                    if self.max_bytes is None or size <= self.max_bytes:
+                        self._d[key] = val
+                        self._sizes[key] = size
+                        self.nbytes += size
+                        while len(self._d) > self.max_items or (
+                                self.max_bytes is not None and self.nbytes > self.max_bytes):
+                            old, _ = self._d.popitem(last=False)
+                            self.nbytes -= self._sizes.pop(old)
+                return val
+            finally:
+                with self._lock:
+                    self._loading.pop(key, None)
+
+_frames = LRUCache(max_items=128, max_bytes=512 * 2**20)
+
+def read_frame(p: Path) -> pd.DataFrame:
+    """Decoded CSV (timestamp parsed), shared across callers until the file changes.
+    Treat the returned frame as read-only."""
+    return _frames.get(fingerprint(p), lambda: pd.read_csv(p, parse_dates=["timestamp"]))
+
+def read_json(p: Path) -> dict:
+    return _frames.get(fingerprint(p), lambda: json.loads(Path(p).read_text(encoding="utf-8")))
@@ -23,6 +23,15 @@ def extract_duids_from_zip(zpath: Path):
         return data["DUID"].astype(str).str.upper().tolist()
 
 zdir = Path(sys.argv[1])
+if zdir.suffix == ".scm":
+    # day mirror: DUIDs and row counts are in the index, nothing is decompressed
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+    from src.scada_mirror import ScadaMirror
+    with ScadaMirror(zdir) as m:
+        print(f"Mirror {zdir.name}: {len(m.intervals)} intervals")
+        print("Top DUIDs by count:\n")
+        print(pd.Series(m.counts, name="count").sort_values(ascending=False, kind="stable").head(50))
+    sys.exit(0)
 duids = []
 count = 0
 for zf in sorted(zdir.glob("PUBLIC_DISPATCHSCADA_*.zip")):
@@ -0,0 +1,139 @@
+# src/duid_registry.py
+from __future__ import annotations
+import argparse, os
+from pathlib import Path
+from typing import List
+import numpy as np
+import pandas as pd
+
+REGISTRY_CSV = os.getenv("AEMO_DUID_REGISTRY", "data/registry/duids.csv")
+REGISTRY_COLUMNS = ["duid","station_name","region","fuel_type","technology","registered_capacity_mw","storage_mwh"]
+UNKNOWN = "UNKNOWN"
+FLEET_COLUMNS = ["timestamp","dimension","key","power_MW","n_units","capacity_mw","capacity_factor"]
+
+def load_registry(path: str | Path = REGISTRY_CSV) -> pd.DataFrame:
+    """DUID metadata, one row per DUID; region/fuel_type/technology are categoricals."""
+    path = Path(path)
+    if not path.exists():
+        return pd.DataFrame(columns=REGISTRY_COLUMNS)
+    reg = pd.read_csv(path, dtype={"duid": str})
+    reg["duid"] = reg["duid"].str.strip().str.upper()
+    for c in ("region", "fuel_type", "technology"):
+        reg[c] = reg[c].fillna(UNKNOWN).astype("category")
+    for c in ("registered_capacity_mw", "storage_mwh"):
+        reg[c] = pd.to_numeric(reg[c], errors="coerce")
+    return reg.drop_duplicates("duid", keep="last").reset_index(drop=True)
+
+def registry_duids(reg: pd.DataFrame | None = None) -> List[str]:
+    reg = load_registry() if reg is None else reg
+    return reg["duid"].tolist()
+
+def bess_duids(reg: pd.DataFrame | None = None) -> List[str]:
+    reg = load_registry() if reg is None else reg
+    return reg.loc[reg["technology"].astype(str) == "BESS", "duid"].tolist()
+
+def duid_codes(duids: pd.Series, reg: pd.DataFrame) -> np.ndarray:
+    """Registry row index per interval row (-1 = not in registry), via categorical codes."""
+    return pd.Categorical(duids.astype(str).str.upper(), categories=reg["duid"]).codes.astype(np.int64)
+
+def attach(df: pd.DataFrame, reg: pd.DataFrame | None = None) -> pd.DataFrame:
+    """Add region / fuel_type / technology / capacity columns to interval rows without a merge."""
+    reg = load_registry() if reg is None else reg
+    code = duid_codes(df["duid"], reg)
+    out = df.copy()
+    for c in ("region", "fuel_type", "technology"):
+        cats = reg[c].cat.add_categories([UNKNOWN]) if UNKNOWN not in reg[c].cat.categories else reg[c]
+        vals = np.where(code >= 0, cats.cat.codes.to_numpy()[code], cats.cat.categories.get_loc(UNKNOWN))
+        out[c] = pd.Categorical.from_codes(vals, categories=cats.cat.categories)
+    out["registered_capacity_mw"] = np.where(code >= 0, reg["registered_capacity_mw"].to_numpy()[code], np.nan)
+    return out
+
+def _group_sum(t_code: np.ndarray, g_code: np.ndarray, n_g: int, n_t: int, w: np.ndarray) -> np.ndarray:
+    return np.bincount(t_code * n_g + g_code, weights=w, minlength=n_t * n_g).reshape(n_t, n_g)
+
+def fleet_aggregates(df: pd.DataFrame, reg: pd.DataFrame | None = None) -> pd.DataFrame:
+    """Per-interval fleet views in long form: totals by region and by technology (with capacity
+    factor vs registered capacity of the reporting units), plus BESS net charge (MW, >0 = charging)."""
+    reg = load_registry() if reg is None else reg
+    if df.empty:
+        return pd.DataFrame(columns=FLEET_COLUMNS)
+    a = attach(df, reg)
+    p = pd.to_numeric(a["power_MW"], errors="coerce").to_numpy(dtype=float)
+    ok = ~np.isnan(p)
+    ts_cat = pd.Categorical(a["timestamp"])
+    t_code, times = ts_cat.codes.astype(np.int64), ts_cat.categories
+    cap = a["registered_capacity_mw"].to_numpy(dtype=float)
+    has_cap = ok & ~np.isnan(cap)
+    parts = []
+    for dim in ("region", "technology"):
+        g = a[dim].cat
+        gc, keys, n_g = g.codes.astype(np.int64), g.categories, len(g.categories)
+        mw = _group_sum(t_code, gc, n_g, len(times), np.where(ok, p, 0.0))
+        n = _group_sum(t_code, gc, n_g, len(times), ok.astype(float))
+        capsum = _group_sum(t_code, gc, n_g, len(times), np.where(has_cap, cap, 0.0))
+        mw_cap = _group_sum(t_code, gc, n_g, len(times), np.where(has_cap, p, 0.0))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cf = np.where(capsum > 0, mw_cap / capsum, np.nan)
+        T, G = np.nonzero(n > 0)
+        parts.append(pd.DataFrame({
+            "timestamp": times[T], "dimension": dim, "key": np.asarray(keys)[G],
+            "power_MW": mw[T, G], "n_units": n[T, G].astype(int),
+            "capacity_mw": np.where(capsum[T, G] > 0, capsum[T, G], np.nan), "capacity_factor": cf[T, G],
+        }))
+    is_bess = ok & (a["technology"].astype(str).to_numpy() == "BESS")
+    if is_bess.any():
+        net = -np.bincount(t_code[is_bess], weights=p[is_bess], minlength=len(times))
+        n = np.bincount(t_code[is_bess], minlength=len(times))
+        T = np.flatnonzero(n)
+        parts.append(pd.DataFrame({
+            "timestamp": times[T], "dimension": "bess", "key": "net_charge", "power_MW": net[T],
+            "n_units": n[T], "capacity_mw": np.nan, "capacity_factor": np.nan,
+        }))
+    return pd.concat(parts, ignore_index=True).sort_values(["dimension","key","timestamp"]).reset_index(drop=True)
+
+def fleet_path(day: str, outdir: str | Path = "data/fleet") -> Path:
+    return Path(outdir) / f"fleet_{day}.csv"
+
+def write_fleet(df: pd.DataFrame, outdir: str | Path = "data/fleet", reg: pd.DataFrame | None = None) -> Path:
+    """Materialize the day's fleet aggregates next to the raw CSVs (called at ingest)."""
+    day = pd.to_datetime(df["timestamp"]).min().strftime("%Y-%m-%d")
+    out = fleet_path(day, outdir); out.parent.mkdir(parents=True, exist_ok=True)
+    fleet_aggregates(df.assign(timestamp=pd.to_datetime(df["timestamp"])), reg).to_csv(out, index=False)
+    return out
+
+def fleet_markdown(fleet: pd.DataFrame) -> str:
+    """Daily fleet section for the report: energy and mean capacity factor per region/technology."""
+    if fleet.empty:
+        return ""
+    lines = ["## Fleet"]
+    for dim, sub in fleet.groupby("dimension", sort=True):
+        g = sub.groupby("key").agg(mwh=("power_MW", lambda s: s.sum()*5/60), cf=("capacity_factor","mean"),
+                                   units=("n_units","max"))
+        label = {"region": "By region", "technology": "By technology", "bess": "BESS net charge"}.get(dim, dim)
+        items = [f"{k} **{r.mwh:,.1f} MWh**" + (f" (CF {100*r.cf:.0f}%)" if pd.notna(r.cf) else "")
+                 for k, r in g.iterrows()]
+        lines.append(f"- {label}: " + ", ".join(items))
+    return "\n".join(lines) + "\n"
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--glob", default="data/aemo/aemo_*_*_5min.csv", help="Daily CSVs to (re)materialize")
+    ap.add_argument("--outdir", default="data/fleet")
+    args = ap.parse_args()
+    reg = load_registry()
+    if reg.empty:
+        raise SystemExit(f"No DUID registry at {REGISTRY_CSV}.")
+    files = sorted(Path().glob(args.glob))
+    if not files:
+        raise SystemExit(f"No CSVs match {args.glob}.")
+    by_day = {}
+    for f in files:
+        df = pd.read_csv(f, parse_dates=["timestamp"])
+        by_day.setdefault(df["timestamp"].min().strftime("%Y-%m-%d"), []).append(df)
+    for day, dfs in by_day.items():
+        df = pd.concat(dfs, ignore_index=True).drop_duplicates(["duid","timestamp"], keep="last")
+        out = write_fleet(df, args.outdir, reg)
+        print(f"✅ wrote {out}")
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@ sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 from src.aemo_banner import (   
     make_session, fetch_archive_day_df, fetch_current_day_df, filter_duids
 )
+from src.duid_registry import registry_duids, write_fleet
 
 def fetch_day(day: str, duids: list[str], source: str = "auto") -> pd.DataFrame:
     ts = pd.to_datetime(day); yyyymmdd = ts.strftime("%Y%m%d")
@@ -30,18 +31,28 @@ def fetch_day(day: str, duids: list[str], source: str = "auto") -> pd.DataFrame:
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--day", required=True, help="YYYY-MM-DD (NEM local date)")
-    ap.add_argument("--duids", required=True, help='Comma list "DUID1,DUID2" or "*" for all')
+    ap.add_argument("--duids", required=True,
+                    help='Comma list "DUID1,DUID2", "*" for all, or "registry" for data/registry/duids.csv')
     ap.add_argument("--outdir", default="data/aemo")
     ap.add_argument("--source", choices=["auto","archive","current"], default="auto")
+    ap.add_argument("--fleet-outdir", default="data/fleet",
+                    help="where fleet_YYYY-MM-DD.csv goes (registry fetches only)")
     args = ap.parse_args()
 
-    duids = [d.strip() for d in args.duids.split(",")]
+    use_registry = args.duids.strip().lower() == "registry"
+    duids = registry_duids() if use_registry else [d.strip() for d in args.duids.split(",")]
+    if not duids:
+        raise SystemExit("Empty DUID list (is data/registry/duids.csv present?).")
     df = fetch_day(args.day, duids, source=args.source)
     outdir = Path(args.outdir); outdir.mkdir(parents=True, exist_ok=True)
-    duid_tag = "ALL" if duids == ["*"] else "_".join([d.upper() for d in duids])
+    # a registry of dozens of units would overflow the 255-byte file name limit
+    duid_tag = "ALL" if duids == ["*"] else "REGISTRY" if use_registry else "_".join([d.upper() for d in duids])
     out = outdir / f"aemo_{args.day}_{duid_tag}_5min.csv"
     df.to_csv(out, index=False)
     print(f"✅ wrote {out} rows={len(df):,}")
+    # fleet totals only mean something over the whole registry, not "*" or an ad-hoc list
+    if use_registry:
+        print(f"✅ wrote {write_fleet(df, args.fleet_outdir)}")
 
 if __name__ == "__main__":
     main()
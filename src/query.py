@@ -0,0 +1,138 @@
+# src/query.py
+"""SQL over the files in data/ through an embedded DuckDB — nothing is loaded into pandas first.
+
+Views:
+  intervals    timestamp, duid, power_MW, day, file    (one row per duid/timestamp; later files win)
+  reports      duid, day, n_rows, …, json               (one row per DUID per report_*.json)
+  forecasts    source_day, timestamp, duid, power_hat_MW
+  ramp_alerts  source_day, timestamp, duid, predicted_ramp_MW
+  fleet        timestamp, dimension, key, power_MW, n_units, capacity_mw, capacity_factor
+  registry     duid, station_name, region, fuel_type, technology, registered_capacity_mw, storage_mwh
+
+    python -m src.query "SELECT duid, max(ramp_95p) r FROM reports GROUP BY 1 ORDER BY r DESC LIMIT 20"
+    python -m src.query --since 2025-10-01 --until 2025-10-31 --format arrow --out oct.arrow \\
+        "SELECT day, duid, sum(power_MW)/12 AS mwh FROM intervals GROUP BY ALL"
+"""
+from __future__ import annotations
+import argparse, csv, sys
+from pathlib import Path
+from typing import List
+from src.data_store import files_in_range
+
+REPORT_FIELDS = {
+    "n_rows": "BIGINT", "p_min": "DOUBLE", "p_max": "DOUBLE", "p_mean": "DOUBLE",
+    "energy_mwh": "DOUBLE", "zero_frac": "DOUBLE", "neg_frac": "DOUBLE", "ramp_max": "DOUBLE",
+    "ramp_95p": "DOUBLE", "anomalies": "BIGINT", "slope_mw_per_hr": "DOUBLE",
+    "intraday_up_bursts": "BIGINT", "intraday_down_bursts": "BIGINT",
+    "n_missing": "BIGINT", "coverage": "DOUBLE",
+    "charge_mwh": "DOUBLE", "discharge_mwh": "DOUBLE", "equiv_full_cycles": "DOUBLE",
+}
+
+def _files(folder: Path, pattern: str, since: str | None, until: str | None) -> List[str]:
+    """Prune files by the day in their name, so date filters never open out-of-range files."""
+    return [f.as_posix() for f in files_in_range(folder, pattern, since, until)]
+
+def _sql_list(files: List[str]) -> str:
+    return "[" + ", ".join("'" + f.replace("'", "''") + "'" for f in files) + "]"
+
+def connect(data_dir: str | Path = "data", since: str | None = None, until: str | None = None,
+            database: str = ":memory:"):
+    """DuckDB connection with the data/ views registered (optionally limited to a day range)."""
+    import duckdb
+    data_dir = Path(data_dir)
+    con = duckdb.connect(database)
+
+    aemo = _files(data_dir / "aemo", "aemo_*_*_5min.csv", since, until)
+    if aemo:
+        con.execute(f"""
+            CREATE VIEW intervals AS
+            SELECT timestamp, duid, arg_max(power_MW, filename) AS power_MW,
+                   strftime(timestamp, '%Y-%m-%d') AS day, max(filename) AS file
+            FROM read_csv({_sql_list(aemo)}, filename=true, header=true, auto_detect=false, delim=',',
+                          columns={{'timestamp': 'TIMESTAMP', 'duid': 'VARCHAR', 'power_MW': 'DOUBLE'}})
+            GROUP BY timestamp, duid""")
+    else:
+        con.execute("CREATE VIEW intervals AS SELECT NULL::TIMESTAMP AS timestamp, NULL::VARCHAR AS duid, "
+                    "NULL::DOUBLE AS power_MW, NULL::VARCHAR AS day, NULL::VARCHAR AS file WHERE false")
+
+    reps = _files(data_dir / "reports", "report_*.json", since, until)
+    cols = ", ".join(f"TRY_CAST(json_extract_string(v, '$.{k}') AS {t}) AS {k}" for k, t in REPORT_FIELDS.items())
+    if reps:
+        con.execute(f"""
+            CREATE VIEW reports AS
+            SELECT duid, json_extract_string(v, '$.day') AS day, {cols}, v AS json
+            FROM (SELECT k AS duid, json_extract(json, '$."' || k || '"') AS v
+                  FROM (SELECT json, unnest(json_keys(json)) AS k
+                        FROM read_json_objects({_sql_list(reps)}, format='auto')))""")
+    else:
+        con.execute(f"CREATE VIEW reports AS SELECT NULL::VARCHAR AS duid, NULL::VARCHAR AS day, "
+                    f"{', '.join(f'NULL::{t} AS {k}' for k, t in REPORT_FIELDS.items())}, NULL::JSON AS json WHERE false")
+
+    for view, pattern, value in (("forecasts", "forecast_*_nextday.csv", "power_hat_MW"),
+                                 ("ramp_alerts", "ramp_alerts_*_nextday.csv", "predicted_ramp_MW")):
+        files = _files(data_dir / "forecast", pattern, since, until)
+        if files:
+            con.execute(f"""
+                CREATE VIEW {view} AS
+                SELECT regexp_extract(filename, '_(\\d{{4}}-\\d{{2}}-\\d{{2}})_', 1) AS source_day,
+                       timestamp, duid, {value}
+                FROM read_csv({_sql_list(files)}, filename=true, header=true, auto_detect=false, delim=',',
+                              columns={{'timestamp': 'TIMESTAMP', 'duid': 'VARCHAR', '{value}': 'DOUBLE'}})""")
+        else:
+            con.execute(f"CREATE VIEW {view} AS SELECT NULL::VARCHAR AS source_day, NULL::TIMESTAMP AS timestamp, "
+                        f"NULL::VARCHAR AS duid, NULL::DOUBLE AS {value} WHERE false")
+
+    fleet = _files(data_dir / "fleet", "fleet_*.csv", since, until)
+    if fleet:
+        con.execute(f"""
+            CREATE VIEW fleet AS SELECT * FROM read_csv({_sql_list(fleet)}, header=true, auto_detect=false, delim=',',
+                columns={{'timestamp': 'TIMESTAMP', 'dimension': 'VARCHAR', 'key': 'VARCHAR', 'power_MW': 'DOUBLE',
+                          'n_units': 'BIGINT', 'capacity_mw': 'DOUBLE', 'capacity_factor': 'DOUBLE'}})""")
+    reg = data_dir / "registry" / "duids.csv"
+    if reg.exists():
+        con.execute(f"CREATE VIEW registry AS SELECT * FROM read_csv({_sql_list([reg.as_posix()])}, header=true)")
+    return con
+
+def query(sql: str, **kw):
+    """Run sql and return a pyarrow RecordBatchReader (streams; call .read_pandas() for a frame)."""
+    res = connect(**kw).execute(sql)
+    return res.to_arrow_reader() if hasattr(res, "to_arrow_reader") else res.fetch_record_batch()
+
+def write_stream(reader, fmt: str, out) -> int:
+    """Write batches as they arrive: CSV text, or Arrow IPC stream bytes. Returns row count."""
+    n = 0
+    if fmt == "arrow":
+        import pyarrow as pa
+        with pa.ipc.new_stream(out, reader.schema) as w:
+            for b in reader:
+                w.write_batch(b); n += b.num_rows
+        return n
+    w = csv.writer(out, lineterminator="\n")
+    w.writerow(reader.schema.names)
+    for b in reader:
+        cols = [c.to_pylist() for c in b.columns]
+        w.writerows(zip(*cols)); n += b.num_rows
+    return n
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("sql", help="SQL over the intervals / reports / forecasts / ramp_alerts views")
+    ap.add_argument("--data", default="data")
+    ap.add_argument("--since", help="YYYY-MM-DD; files for earlier days are not opened")
+    ap.add_argument("--until", help="YYYY-MM-DD; files for later days are not opened")
+    ap.add_argument("--format", choices=["csv","arrow"], default="csv")
+    ap.add_argument("--out", default="-", help="output path, '-' for stdout")
+    args = ap.parse_args()
+
+    reader = query(args.sql, data_dir=args.data, since=args.since, until=args.until)
+    if args.out == "-":
+        out = sys.stdout.buffer if args.format == "arrow" else sys.stdout
+        write_stream(reader, args.format, out)
+        return
+    Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+    with open(args.out, "wb" if args.format == "arrow" else "w", newline="" if args.format == "csv" else None) as fp:
+        n = write_stream(reader, args.format, fp)
+    print(f"✅ wrote {args.out} rows={n:,}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
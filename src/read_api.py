@@ -0,0 +1,151 @@
+# src/read_api.py
+"""Local read-only HTTP API over data/ (stdlib server, one shared cache of parsed frames).
+
+    python -m src.read_api --port 8765
+
+GET /days                                   days with interval data
+GET /intervals?start=&end=&duid=A,B         5-min rows (start YYYY-MM-DD required; end inclusive,
+                                            defaults to start, at most MAX_INTERVAL_DAYS later)
+GET /report/latest                          newest report_*.json
+GET /forecast/latest?duid=                  newest forecast_*_nextday.csv
+GET /ramp_alerts/latest?duid=               newest ramp_alerts_*_nextday.csv
+GET /fleet?start=&end=&dimension=           materialized fleet aggregates
+
+Frames are returned as Arrow IPC streams when the client sends
+`Accept: application/vnd.apache.arrow.stream` (or ?format=arrow), otherwise as compact
+column-split JSON. Every response carries an ETag built from the source files' (path, mtime,
+size) and the query; a matching If-None-Match gets 304 without touching the files.
+"""
+from __future__ import annotations
+import argparse, io, json
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import List, Tuple
+from urllib.parse import parse_qs, urlparse
+import pandas as pd
+from src.data_store import (DATA_ROOT, LRUCache, etag_for, file_day, files_in_range, latest_file,
+                            read_frame, read_json)
+
+ARROW_MIME = "application/vnd.apache.arrow.stream"
+# encoded (body, ctype) keyed by (etag, format), bounded by body bytes
+_bodies = LRUCache(max_items=256, max_bytes=256 * 2**20, sizeof=lambda v: len(v[0]))
+MAX_INTERVAL_DAYS = 31
+
+class BadRequest(ValueError):
+    pass
+
+def _concat(files: List[Path]) -> pd.DataFrame:
+    if not files:
+        return pd.DataFrame(columns=["timestamp","duid","power_MW"])
+    df = pd.concat([read_frame(f) for f in files], ignore_index=True)
+    return df.drop_duplicates(["duid","timestamp"], keep="last") if "duid" in df else df
+
+def _filter(df: pd.DataFrame, q: dict, col: str, param: str) -> pd.DataFrame:
+    vals = [v.strip().upper() for v in q.get(param, [""])[0].split(",") if v.strip()]
+    return df[df[col].astype(str).str.upper().isin(vals)] if vals and col in df else df
+
+def encode_frame(df: pd.DataFrame, fmt: str) -> Tuple[bytes, str]:
+    if fmt == "arrow":
+        import pyarrow as pa
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        sink = io.BytesIO()
+        with pa.ipc.new_stream(sink, table.schema) as w:
+            w.write_table(table)
+        return sink.getvalue(), ARROW_MIME
+    return df.to_json(orient="split", index=False, date_format="iso").encode(), "application/json"
+
+def resolve(path: str, q: dict) -> Tuple[List[Path], object]:
+    """Map a request to (source files, producer of the payload). Producers run only on a miss."""
+    root = DATA_ROOT
+    first = lambda k: q.get(k, [None])[0]
+    if path == "/days":
+        files = sorted((root / "aemo").glob("aemo_*_*_5min.csv"))
+        return files, lambda: {"days": sorted({d for d in map(file_day, files) if d})}
+    if path == "/intervals":
+        start, end = first("start"), first("end") or first("start")
+        try:
+            span = (date.fromisoformat(end) - date.fromisoformat(start)).days if start else None
+        except ValueError:
+            raise BadRequest("start/end must be YYYY-MM-DD")
+        if span is None or not 0 <= span < MAX_INTERVAL_DAYS:
+            raise BadRequest(f"/intervals needs start (and optional end) spanning 1-{MAX_INTERVAL_DAYS} days")
+        files = files_in_range(root / "aemo", "aemo_*_*_5min.csv", start, end)
+        return files, lambda: _filter(_concat(files), q, "duid", "duid").sort_values(["duid","timestamp"])
+    if path == "/report/latest":
+        f = latest_file(root / "reports", "report_*.json")
+        return ([f] if f else []), lambda: (read_json(f) if f else {})
+    for route, pattern in (("/forecast/latest", "forecast_*_nextday.csv"),
+                           ("/ramp_alerts/latest", "ramp_alerts_*_nextday.csv")):
+        if path == route:
+            f = latest_file(root / "forecast", pattern)
+            return ([f] if f else []), lambda f=f: _filter(read_frame(f), q, "duid", "duid") if f else pd.DataFrame()
+    if path == "/fleet":
+        files = files_in_range(root / "fleet", "fleet_*.csv", first("start"), first("end"))
+        return files, lambda: _filter(_concat(files), q, "dimension", "dimension")
+    raise KeyError(path)
+
+class Handler(BaseHTTPRequestHandler):
+    server_version = "aemo-read-api/1.0"
+
+    def do_GET(self):
+        u = urlparse(self.path)
+        q = parse_qs(u.query)
+        try:
+            files, produce = resolve(u.path.rstrip("/") or "/", q)
+        except KeyError:
+            return self._send(404, b'{"error":"not found"}', "application/json")
+        except BadRequest as e:
+            return self._send(400, json.dumps({"error": str(e)}).encode(), "application/json")
+        accept = self.headers.get("Accept", "")
+        fmt = q.get("format", ["arrow" if ARROW_MIME in accept else "json"])[0]
+        etag = etag_for(files, u.path, sorted(q.items()), fmt)
+        if etag in [t.strip() for t in self.headers.get("If-None-Match", "").split(",")]:
+            return self._send(304, b"", None, etag)
+
+        def build():
+            payload = produce()
+            if isinstance(payload, pd.DataFrame):
+                return encode_frame(payload, fmt)
+            return json.dumps(payload, separators=(",", ":")).encode(), "application/json"
+        try:
+            body, ctype = _bodies.get((etag, fmt), build)
+        except Exception as e:
+            return self._send(500, json.dumps({"error": str(e)}).encode(), "application/json")
+        self._send(200, body, ctype, etag)
+
+    do_HEAD = do_GET
+
+    def _send(self, code: int, body: bytes, ctype: str | None, etag: str | None = None):
+        self.send_response(code)
+        if ctype: self.send_header("Content-Type", ctype)
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")   # always revalidate; 304s are cheap
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body and self.command != "HEAD":
+            self.wfile.write(body)
+
+    def log_message(self, fmt, *args):
+        pass
+
+def serve(host: str = "127.0.0.1", port: int = 8765) -> ThreadingHTTPServer:
+    httpd = ThreadingHTTPServer((host, port), Handler)
+    httpd.daemon_threads = True
+    return httpd
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    args = ap.parse_args()
+    httpd = serve(args.host, args.port)
+    print(f"✅ serving {DATA_ROOT.resolve()} on http://{args.host}:{args.port}")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+# src/scada_mirror.py
+"""Compact day mirror of DISPATCH_UNIT_SCADA: one file per day instead of ~288 interval zips.
+
+Layout (all offsets absolute, little-endian):
+    b"AEMOSCM1" | tile 0 | tile 1 | … | footer JSON | u64 footer length | b"AEMOSCM1"
+
+The day is held as an (interval × DUID) float64 matrix (NaN = no row) cut into tiles of
+tile_t intervals × tile_d DUIDs, each zlib-compressed on its own. The footer holds the
+interval stamps, DUIDs, per-DUID row counts and each tile's (offset, length), so reading one
+interval or one DUID only decompresses the tiles that contain it. Only the parsed
+SETTLEMENTDATE / DUID / SCADAVALUE columns are kept (what stitch_dispatch_scada and
+discover_duids use); LASTCHANGED and the banner text are dropped.
+
+    python -m src.scada_mirror build --zips /tmp/aemo_20251031 --out data/mirror/scada_2025-10-31.scm
+    python -m src.scada_mirror read  --mirror data/mirror/scada_2025-10-31.scm --duids CLUNY --out x.csv
+"""
+from __future__ import annotations
+import argparse, io, json, struct, zipfile, zlib
+from pathlib import Path
+from typing import Iterable, Iterator, List, Sequence
+import numpy as np
+import pandas as pd
+
+MAGIC = b"AEMOSCM1"
+VERSION = 1
+STAMP_FMT = "%Y%m%d%H%M"
+
+# ---------- raw input ----------
+def iter_csv_payloads(src: Path) -> Iterator[bytes]:
+    """CSV bytes of every interval: from a folder of PUBLIC_DISPATCHSCADA_*.zip, a single
+    interval zip, or an ARCHIVE day zip that nests the interval zips."""
+    src = Path(src)
+    zips = sorted(src.glob("PUBLIC_DISPATCHSCADA_*.zip")) if src.is_dir() else [src]
+    for zp in zips:
+        yield from _payloads_from_zip(zipfile.ZipFile(zp))
+
+def _payloads_from_zip(z: zipfile.ZipFile) -> Iterator[bytes]:
+    with z:
+        for n in z.namelist():
+            low = n.lower()
+            if low.endswith(".csv"):
+                yield z.read(n)
+            elif low.endswith(".zip"):
+                yield from _payloads_from_zip(zipfile.ZipFile(io.BytesIO(z.read(n))))
+
+def parse_scada_rows(raw: bytes) -> tuple[list, list, list]:
+    """Fast path for the banner CSV: keep `D` rows, take SETTLEMENTDATE, DUID, SCADAVALUE
+    (columns 4-6, the same ones aemo_banner.parse_banner_zip_bytes uses)."""
+    ts, du, val = [], [], []
+    for line in raw.splitlines():
+        if not line.startswith(b"D,"):
+            continue
+        f = line.split(b",")
+        if len(f) < 7:
+            continue
+        ts.append(f[4].strip(b'"')); du.append(f[5].strip(b'"').upper()); val.append(f[6].strip(b'"'))
+    return ts, du, val
+
+# ---------- build ----------
+def build_mirror(payloads: Iterable[bytes], out: Path, tile_t: int = 12, tile_d: int = 64) -> Path:
+    ts, du, val = [], [], []
+    for raw in payloads:
+        a, b, c = parse_scada_rows(raw)
+        ts += a; du += b; val += c
+    if not ts:
+        raise ValueError("No DISPATCH_UNIT_SCADA rows found.")
+    t = pd.to_datetime(pd.Series(ts).str.decode("ascii"), errors="coerce", format="mixed")
+    v = pd.to_numeric(pd.Series(val).str.decode("ascii"), errors="coerce").to_numpy(dtype=np.float64)
+    keep = t.notna().to_numpy()
+    t_code, stamps = pd.factorize(t[keep], sort=True)
+    d_code, duids = pd.factorize(pd.Series(du)[keep].str.decode("ascii"), sort=True)
+    M = np.full((len(stamps), len(duids)), np.nan)
+    M[t_code, d_code] = v[keep]          # duplicate rows: last one wins
+
+    out = Path(out); out.parent.mkdir(parents=True, exist_ok=True)
+    tiles = []
+    with open(out, "wb") as fp:
+        fp.write(MAGIC)
+        for t0 in range(0, M.shape[0], tile_t):
+            for d0 in range(0, M.shape[1], tile_d):
+                blob = zlib.compress(np.ascontiguousarray(M[t0:t0+tile_t, d0:d0+tile_d]).tobytes(), 6)
+                tiles.append([fp.tell(), len(blob)])
+                fp.write(blob)
+        footer = json.dumps({
+            "version": VERSION, "tile_t": tile_t, "tile_d": tile_d, "dtype": "<f8",
+            "intervals": [s.strftime(STAMP_FMT) for s in stamps], "duids": list(duids),
+            "counts": np.count_nonzero(~np.isnan(M), axis=0).tolist(), "tiles": tiles,
+        }, separators=(",", ":")).encode()
+        fp.write(footer); fp.write(struct.pack("<Q", len(footer))); fp.write(MAGIC)
+    return out
+
+# ---------- random access ----------
+class ScadaMirror:
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._fp = open(self.path, "rb")
+        if self._fp.read(8) != MAGIC:
+            raise ValueError(f"{self.path} is not a SCADA mirror")
+        self._fp.seek(-16, io.SEEK_END)
+        (n,), magic = struct.unpack("<Q", self._fp.read(8)), self._fp.read(8)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is truncated")
+        self._fp.seek(-16 - n, io.SEEK_END)
+        meta = json.loads(self._fp.read(n))
+        self.tile_t, self.tile_d = meta["tile_t"], meta["tile_d"]
+        self.intervals = pd.to_datetime(meta["intervals"], format=STAMP_FMT)
+        self.duids: List[str] = meta["duids"]
+        self.counts = dict(zip(self.duids, meta["counts"]))
+        self._tiles = meta["tiles"]
+        self._n_dtiles = -(-len(self.duids) // self.tile_d)
+        self._d_index = {d: i for i, d in enumerate(self.duids)}
+        self.tiles_read = 0
+
+    def close(self): self._fp.close()
+    def __enter__(self): return self
+    def __exit__(self, *exc): self.close()
+
+    def _tile(self, ti: int, di: int) -> np.ndarray:
+        off, ln = self._tiles[ti * self._n_dtiles + di]
+        self._fp.seek(off)
+        a = np.frombuffer(zlib.decompress(self._fp.read(ln)), dtype="<f8")
+        rows = min(self.tile_t, len(self.intervals) - ti * self.tile_t)
+        self.tiles_read += 1
+        return a.reshape(rows, -1)
+
+    def read(self, duids: Sequence[str] | None = None, start=None, end=None) -> pd.DataFrame:
+        """Rows for the given DUIDs (default all) and interval range, as timestamp/duid/power_MW.
+        Only the tiles overlapping the request are decompressed."""
+        t_idx = np.arange(len(self.intervals))
+        if start is not None: t_idx = t_idx[self.intervals[t_idx] >= pd.Timestamp(start)]
+        if end is not None: t_idx = t_idx[self.intervals[t_idx] <= pd.Timestamp(end)]
+        d_idx = (np.arange(len(self.duids)) if duids is None else
+                 np.array(sorted(self._d_index[d.upper()] for d in duids if d.upper() in self._d_index), dtype=int))
+        if not len(t_idx) or not len(d_idx):
+            return pd.DataFrame(columns=["timestamp", "duid", "power_MW"])
+        out = np.empty((len(t_idx), len(d_idx)))
+        t_tiles, d_tiles = t_idx // self.tile_t, d_idx // self.tile_d
+        for ti in np.unique(t_tiles):
+            rsel = np.flatnonzero(t_tiles == ti)
+            for di in np.unique(d_tiles):
+                csel = np.flatnonzero(d_tiles == di)
+                tile = self._tile(int(ti), int(di))
+                out[np.ix_(rsel, csel)] = tile[np.ix_(t_idx[rsel] - ti*self.tile_t, d_idx[csel] - di*self.tile_d)]
+        T, D = np.nonzero(~np.isnan(out))
+        df = pd.DataFrame({"timestamp": self.intervals[t_idx[T]], "duid": np.asarray(self.duids)[d_idx[D]],
+                           "power_MW": out[T, D]})
+        return df.sort_values(["duid", "timestamp"]).reset_index(drop=True)
+
+    def read_interval(self, ts) -> pd.DataFrame:
+        return self.read(start=ts, end=ts)
+
+    def read_duid(self, duid: str) -> pd.DataFrame:
+        return self.read(duids=[duid])
+
+def main():
+    ap = argparse.ArgumentParser()
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build", help="repack interval zips (folder, or ARCHIVE day zip) into one mirror")
+    b.add_argument("--zips", required=True)
+    b.add_argument("--out", required=True)
+    b.add_argument("--tile-t", type=int, default=12)
+    b.add_argument("--tile-d", type=int, default=64)
+    r = sub.add_parser("read", help="export rows from a mirror")
+    r.add_argument("--mirror", required=True)
+    r.add_argument("--duids", default="*")
+    r.add_argument("--start"); r.add_argument("--end")
+    r.add_argument("--out", required=True)
+    args = ap.parse_args()
+
+    if args.cmd == "build":
+        out = build_mirror(iter_csv_payloads(Path(args.zips)), Path(args.out), args.tile_t, args.tile_d)
+        with ScadaMirror(out) as m:
+            print(f"✅ wrote {out} intervals={len(m.intervals)} duids={len(m.duids)} "
+                  f"bytes={out.stat().st_size:,}")
+    else:
+        want = [d.strip().upper() for d in args.duids.split(",") if d.strip()]
+        with ScadaMirror(args.mirror) as m:
+            df = m.read(None if want == ["*"] else want, args.start, args.end)
+        Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+        df.to_csv(args.out, index=False)
+        print(f"✅ wrote {args.out} rows={len(df):,}")
+
+if __name__ == "__main__":
+    main()
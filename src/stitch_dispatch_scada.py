@@ -1,6 +1,8 @@
-import argparse, zipfile, io
+import argparse, zipfile, io, sys
 from pathlib import Path
 import pandas as pd
+# also runnable as `python src/stitch_dispatch_scada.py` (fetch_aemo_current_day.ps1)
+sys.path.append(str(Path(__file__).resolve().parents[1]))
 
 def read_banner_csv_from_zip(zpath: Path) -> pd.DataFrame:
     """Parse AEMO banner format: keep only rows with C=='D'; take cols 4:8."""
@@ -26,20 +28,11 @@ def read_banner_csv_from_zip(zpath: Path) -> pd.DataFrame:
         data.rename(columns={"DUID":"duid","SCADAVALUE":"power_MW"}, inplace=True)
         return data[["timestamp","duid","power_MW"]]
 
-def main():
-    ap = argparse.ArgumentParser()
-    ap.add_argument("--zips", required=True, help="Folder with PUBLIC_DISPATCHSCADA_*.zip")
-    ap.add_argument("--duids", required=True, help='Comma list "DUID1,DUID2" or "*" for all')
-    ap.add_argument("--out", required=True, help="Output CSV path")
-    args = ap.parse_args()
-
-    want = [d.strip().upper() for d in args.duids.split(",") if d.strip()]
-    want_all = (len(want)==1 and want[0]=="*")
-
-    zips = sorted(Path(args.zips).glob("PUBLIC_DISPATCHSCADA_*.zip"))
+def read_from_zips(folder: Path, want) -> tuple[list, set]:
+    """Row frames for the wanted DUIDs (None = all) from each interval zip, plus every DUID seen."""
+    zips = sorted(folder.glob("PUBLIC_DISPATCHSCADA_*.zip"))
     if not zips:
         raise SystemExit("No zip chunks found in --zips folder.")
-
     parts, seen = [], set()
     for z in zips:
         df = read_banner_csv_from_zip(z)
@@ -47,10 +40,42 @@ def main():
             continue
         df["duid"] = df["duid"].str.upper()
         seen.update(df["duid"].unique())
-        if not want_all:
+        if want is not None:
             df = df[df["duid"].isin(want)]
         if not df.empty:
             parts.append(df)
+    return parts, seen
+
+def read_from_mirror(path: Path, want) -> tuple[list, set]:
+    from src.scada_mirror import ScadaMirror
+    with ScadaMirror(path) as m:
+        df = m.read(want)
+        return ([df] if not df.empty else []), set(m.duids)
+
+def main():
+    ap = argparse.ArgumentParser()
+    src = ap.add_mutually_exclusive_group(required=True)
+    src.add_argument("--zips", help="Folder with PUBLIC_DISPATCHSCADA_*.zip")
+    src.add_argument("--mirror", help="Day mirror built by src.scada_mirror (.scm)")
+    ap.add_argument("--duids", required=True, help='Comma list "DUID1,DUID2" or "*" for all')
+    ap.add_argument("--out", required=True, help="Output CSV path")
+    ap.add_argument("--write-mirror", help="Also repack --zips into this .scm mirror and read from it")
+    args = ap.parse_args()
+    if args.mirror and args.write_mirror:
+        ap.error("--write-mirror repacks --zips; it cannot be combined with --mirror")
+
+    want = [d.strip().upper() for d in args.duids.split(",") if d.strip()]
+    want_all = (len(want)==1 and want[0]=="*")
+
+    if args.mirror or args.write_mirror:
+        mirror = Path(args.mirror or args.write_mirror)
+        if args.write_mirror:
+            from src.scada_mirror import build_mirror, iter_csv_payloads
+            build_mirror(iter_csv_payloads(Path(args.zips)), mirror)
+            print(f"✅ wrote {mirror}")
+        parts, seen = read_from_mirror(mirror, None if want_all else want)
+    else:
+        parts, seen = read_from_zips(Path(args.zips), None if want_all else want)
 
     print(f"Unique DUIDs seen (first 20): {sorted(list(seen))[:20]}")
     if not parts: